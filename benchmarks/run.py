@@ -0,0 +1,239 @@
+"""
+Per-stage benchmarks of the extraction pipeline.
+
+    python -m benchmarks.run tests/pdfs/*.pdf --save baseline.json
+    python -m benchmarks.run tests/pdfs/*.pdf --compare baseline.json
+
+Each stage is timed on its own (best of --repeat runs) then run once more
+under tracemalloc for the peak memory and the net number of memory blocks
+the stage leaves allocated ('retained' - not a count of allocations).
+"""
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfpage import PDFPage
+from pdfgravy.pdf import Pdf
+from pdfgravy.page import Page
+from pdfgravy.words import Words
+from pdfgravy.outline import Outline
+from pdfgravy import utils
+import tracemalloc
+import argparse
+import time
+import json
+import sys
+import gc
+import io
+
+STAGES = ['interpret', 'ingest', 'get_words', 'get_lines', 'aggregate_elems',
+                        'get_fonts', 'extract_tables', 'get_headed_sections']
+
+class Replay:
+
+    """
+    Stands in for the pdfminer device/interpreter pair so that Page.__init__
+    can be timed without re-interpreting the page.
+    """
+
+    def __init__(self, layouts):
+        self.layouts = layouts
+        self.layout = None
+
+    def process_page(self, page_obj):
+        self.layout = self.layouts[id(page_obj)]
+
+    def get_result(self):
+        return self.layout
+
+def get_stages(data, settings={}, table_settings={}, headers=[], state=None):
+    """
+    Return the (name, fn) stages in order - each fn builds on the state left
+    by the previous ones.
+    :param state: dict the stages share (e.g. to inspect their output).
+    """
+    state = state if state is not None else {}
+
+    conf = Pdf.Settings(settings)
+    extract = conf['extract']
+
+    def interpret():
+        device, interpreter = utils.init_interpreter()
+        device.configure(extract, conf['native_lines'])  # As Pdf.load_pages
+        clip = conf['clip'] if conf['clip'] else {}
+        doc = PDFDocument(PDFParser(io.BytesIO(data)))
+        state['page_objs'] = list(PDFPage.create_pages(doc))
+        state['layouts'] = {}
+        for i, page_obj in enumerate(state['page_objs']):
+            device.clip = clip.get(i+1)
+            interpreter.process_page(page_obj)
+            state['layouts'][id(page_obj)] = device.get_result()
+        state['bmarks'] = Outline(doc)
+        state['bmarks'].resolve()  # For outline sectioning
+
+    def ingest():
+        # Objects (and chars) only - the words/lines are the next stages
+        replay = Replay(state['layouts'])
+        bare = dict(settings, extract=set())
+        state['pages'] = [Page(x, i+1, replay, replay, bare)
+                                    for i, x in enumerate(state['page_objs'])]
+
+    def get_words():
+        if extract is not None and 'words' not in extract:
+            return
+        for page in state['pages']:
+            page.text, page.curves = page.get_text(), page.get_curves()
+            page.words = page.get_words()
+
+    def get_lines():
+        for page in state['pages']:
+            if extract is None or 'lines' in extract:
+                page.lines = page.get_lines()
+            if extract is None:
+                page.boxes = page.get_boxes()
+
+    def aggregate_elems():
+        pdf = object.__new__(Pdf)
+        pdf.settings, pdf.pages = Pdf.Settings(settings), state['pages']
+        pdf.bmarks = state['bmarks']
+        pdf.lines = pdf.aggregate_elems('lines')
+        pdf.words = pdf.aggregate_elems('words', Words)
+        state['pdf'] = pdf
+
+    def get_fonts():
+        pdf = state['pdf']
+        pdf.fonts = pdf.get_fonts() if pdf.words else {}
+
+    def extract_tables():
+        for page in state['pages']:
+            for tbl in page.extract_tables(table_settings).values():
+                try:
+                    tbl.spokes  # Include the (lazy) spoke analysis
+                except Exception:
+                    pass  # Lost like any one failed table (see tbl.error)
+
+    def get_headed_sections():
+        state['pdf'].get_headed_sections(headers)
+
+    fns = locals()
+    return [(x, fns[x]) for x in STAGES]
+
+def measure(fn, traced=False):
+    """
+    Run the stage once returning wall time (and memory use if traced).
+    """
+    gc.collect()
+    if traced:
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+    start = time.perf_counter()
+    fn()
+    out = {'wall': time.perf_counter() - start}
+    if traced:
+        after = tracemalloc.take_snapshot()
+        out['peak'] = tracemalloc.get_traced_memory()[1]
+        out['retained'] = sum([x.count_diff for x in
+                                after.compare_to(before, 'filename')])
+        tracemalloc.stop()
+    return out
+
+def run(data, repeat=3, trace=True, **kwargs):
+    """
+    Benchmark every stage for the pdf bytes.
+    :param trace: also do a run under tracemalloc for the memory use.
+    :return: mapping of stage --> {'wall', 'peak', 'retained'} or {'error'}.
+    """
+    out = {}
+    for i in range(repeat + 1 if trace else repeat):
+        traced = i == repeat  # Memory run last as tracing skews the timings
+        for stage, fn in get_stages(data, **kwargs):
+            if 'error' in out.get(stage, {}):
+                continue
+            try:
+                res = measure(fn, traced)
+            except Exception as e:
+                # Dependent stages will fail too but independent ones still run
+                out[stage] = {'error': f'{type(e).__name__}: {e}'}
+                continue
+            if stage not in out:
+                out[stage] = res
+            elif traced:
+                out[stage].update(peak=res['peak'], retained=res['retained'])
+            else:
+                out[stage]['wall'] = min(out[stage]['wall'], res['wall'])
+    return out
+
+def compare(results, baseline, tolerance=0.2):
+    """
+    Return (doc, stage, metric, old, new) for every metric which got worse
+    than the baseline by more than the tolerance (as a fraction).
+    """
+    out = []
+    for doc, stages in results.items():
+        for stage, res in stages.items():
+            ref = baseline.get(doc, {}).get(stage, {})
+            if 'error' in res and 'error' not in ref:
+                out.append((doc, stage, 'error', None, res['error']))
+            for metric in ['wall', 'peak']:
+                if metric in res and ref.get(metric):
+                    if res[metric] > ref[metric] * (1 + tolerance):
+                        out.append((doc, stage, metric, ref[metric], res[metric]))
+    return out
+
+def report(results, baseline=None):
+    """
+    Print a per doc/stage table - with the change against any baseline.
+    """
+    for doc, stages in results.items():
+        print(doc)
+        for stage, res in stages.items():
+            if 'error' in res:
+                print(f'  {stage:<22}{res["error"]}')
+                continue
+            line = f'  {stage:<22}{res["wall"]*1000:>10.1f} ms' \
+                   f'{res.get("peak", 0)/2**20:>10.2f} MiB{res.get("retained", 0):>10}'
+            ref = (baseline or {}).get(doc, {}).get(stage, {})
+            if ref.get('wall'):
+                line += f'{(res["wall"] / ref["wall"] - 1) * 100:>+10.1f}%'
+            print(line)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='pdfgravy stage benchmarks')
+    parser.add_argument('pdfs', nargs='+')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--settings', default='{}', help='Pdf settings (JSON)')
+    parser.add_argument('--table-settings', default='{}',
+                                            help='Table settings (JSON)')
+    parser.add_argument('--headers', default='',
+                            help='comma separated headers for sectioning')
+    parser.add_argument('--save', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='baseline JSON file to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    kwargs = {'settings': json.loads(args.settings),
+              'table_settings': json.loads(args.table_settings),
+              'headers': [x for x in args.headers.lower().split(',') if x]}
+
+    results = {}
+    for path in args.pdfs:
+        with open(path, 'rb') as f:
+            results[path] = run(f.read(), args.repeat, **kwargs)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    report(results, baseline)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance)
+        for doc, stage, metric, old, new in regressions:
+            print(f'REGRESSION {doc} {stage} {metric}: {old} -> {new}')
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+Complexity scaling of each pipeline stage over growing synthetic pdfs.
+
+    python -m benchmarks.scaling --dim words --sizes 100,200,400,800
+
+The growth exponent k (time ~ size^k) is fitted per stage and the run fails
+if any stage grows faster than its bound, errors, or is one of the required
+stages (--require) but too quick to measure.
+"""
+from . import run, synthetic
+import numpy as np
+import argparse
+import sys
+
+DIMS = ['pages', 'words', 'rows', 'cols', 'rules']
+
+MAX_EXPONENT = 2.0
+
+MIN_WALL = 0.005  # Stages quicker than this at the largest size are noise
+
+def fit_exponent(sizes, times):
+    """
+    Return the slope of log(time) against log(size).
+    """
+    return float(np.polyfit(np.log(sizes), np.log(times), 1)[0])
+
+def scale(dim='words', sizes=[100, 200, 400, 800], base={}, repeat=1,
+                                                                **kwargs):
+    """
+    Time every stage on synthetic pdfs growing along one dimension.
+    :param base: make_pdf kwargs for the dimensions held constant.
+    :return: mapping of stage --> {'times', 'exponent', 'error'} (exponent
+    None where the stage errored or was too quick to measure).
+    """
+    times = {x: [] for x in run.STAGES}
+    errors = {}
+    for size in sizes:
+        data = synthetic.make_pdf(**{**base, dim: size})
+        for stage, res in run.run(data, repeat, trace=False, **kwargs).items():
+            times[stage].append(res.get('wall'))
+            if 'error' in res:
+                errors.setdefault(stage, f'size {size}: {res["error"]}')
+
+    out = {}
+    for stage, ts in times.items():
+        ok = None not in ts and max(ts) >= MIN_WALL
+        out[stage] = {'times': ts, 'error': errors.get(stage),
+                      'exponent': fit_exponent(sizes, ts) if ok else None}
+    return out
+
+def check(results, bounds={}, default=MAX_EXPONENT, required=()):
+    """
+    Return (stage, exponent, bound) for stages growing faster than allowed -
+    plus (stage, None, bound) for those which errored or are required but
+    were too quick to measure.
+    """
+    out = []
+    for stage, res in results.items():
+        bound = bounds.get(stage, default)
+        if res['exponent'] is None:
+            if res.get('error') or stage in required:
+                out.append((stage, None, bound))
+        elif res['exponent'] > bound:
+            out.append((stage, res['exponent'], bound))
+    return out
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='pdfgravy scaling checks')
+    parser.add_argument('--dim', choices=DIMS, default='words')
+    parser.add_argument('--sizes', default='100,200,400,800')
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--max-exponent', type=float, default=MAX_EXPONENT)
+    parser.add_argument('--bound', action='append', default=[],
+                            help='per-stage bound e.g. get_words=1.5')
+    parser.add_argument('--strategy', default='text',
+                            help='table strategy (text or lines)')
+    parser.add_argument('--require', default='interpret,ingest,get_words',
+                    help='stages which must be measured (comma separated)')
+    args = parser.parse_args(argv)
+
+    sizes = [int(x) for x in args.sizes.split(',')]
+    bounds = {k: float(v) for k, v in [x.split('=') for x in args.bound]}
+
+    results = scale(args.dim, sizes, repeat=args.repeat,
+                            table_settings={'strategy': args.strategy})
+    for stage, res in results.items():
+        times = ' '.join([f'{x*1000:.1f}' if x is not None else '-'
+                                                    for x in res['times']])
+        k = f'{res["exponent"]:.2f}' if res['exponent'] is not None else '-'
+        print(f'{stage:<22} k={k:<6} ms: {times}')
+
+    required = [x for x in args.require.split(',') if x]
+    failures = check(results, bounds, args.max_exponent, required)
+    for stage, k, bound in failures:
+        if results[stage]['error']:
+            print(f'FAIL {stage}: {results[stage]["error"]}')
+        elif k is None:
+            print(f'FAIL {stage}: not measured (under {MIN_WALL * 1000} ms)')
+        else:
+            print(f'FAIL {stage}: grows as size^{k:.2f} (bound {bound})')
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+Cold-start benchmarks - each scenario runs in a fresh interpreter (as for a
+short-lived worker) timing the imports plus first use.
+
+    python -m benchmarks.startup --save startup.json
+    python -m benchmarks.startup --compare startup.json
+"""
+from .run import compare
+import subprocess
+import argparse
+import json
+import sys
+
+PDF = 'tests/pdfs/msft.pdf'
+
+SCENARIOS = {
+    'import': 'import pdfgravy',
+    'api': 'import pdfgravy; pdfgravy.Pdf',
+    'words': 'import pdfgravy; pdfgravy.open(PDF, {"extract": {"words"}})',
+    'tables': 'import pdfgravy; pdfgravy.open(PDF).pages[0].extract_tables()'
+}
+
+# Modules worth knowing about when they are (or aren't) loaded
+HEAVY = ['numpy', 'pdfminer', 'lxml', 'statistics', 'concurrent.futures',
+                                            'pdfgravy.table', 'pdfgravy.grid']
+
+PROBE = '''
+import sys, time, json
+PDF = {pdf!r}
+before = set(sys.modules)
+start = time.perf_counter()
+{stmt}
+wall = time.perf_counter() - start
+loaded = set(sys.modules) - before
+print(json.dumps({{'wall': wall, 'modules': len(loaded),
+                  'heavy': [x for x in {heavy!r} if x in loaded]}}))
+'''
+
+def measure(stmt, pdf=PDF):
+    """
+    Run the statement in a new interpreter returning its wall time, number
+    of modules imported and which of the HEAVY ones were among them.
+    """
+    code = PROBE.format(pdf=pdf, stmt=stmt, heavy=HEAVY)
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True,
+                                                        text=True, check=True)
+    return json.loads(out.stdout.splitlines()[-1])
+
+def run(scenarios=SCENARIOS, repeat=5, pdf=PDF):
+    """
+    Best of repeat cold starts for every scenario.
+    """
+    out = {}
+    for name, stmt in scenarios.items():
+        runs = [measure(stmt, pdf) for x in range(repeat)]
+        out[name] = min(runs, key=lambda x: x['wall'])
+    return out
+
+def report(results, baseline=None):
+    for name, res in results.items():
+        line = f'  {name:<10}{res["wall"]*1000:>10.1f} ms{res["modules"]:>6} ' \
+               f'modules  {", ".join(res["heavy"]) or "-"}'
+        ref = (baseline or {}).get(name, {})
+        if ref.get('wall'):
+            line += f'  {(res["wall"] / ref["wall"] - 1) * 100:+.1f}%'
+        print(line)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='pdfgravy cold-start benchmarks')
+    parser.add_argument('--pdf', default=PDF)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--save', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='baseline JSON file to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    results = run(repeat=args.repeat, pdf=args.pdf)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    report(results, baseline)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if baseline is not None:
+        regressions = compare({'startup': results}, {'startup': baseline},
+                                                            args.tolerance)
+        for doc, stage, metric, old, new in regressions:
+            print(f'REGRESSION {stage} {metric}: {old} -> {new}')
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""
+Synthetic pdfs of any size - written by hand (standard 14 fonts so nothing
+needs embedding) for benchmarking beyond the test fixtures.
+"""
+import random
+
+FONTS = ['Helvetica', 'Times-Roman', 'Courier', 'Helvetica-Bold',
+            'Times-Bold', 'Courier-Bold', 'Helvetica-Oblique', 'Times-Italic']
+
+VOCAB = ['energy', 'emissions', 'scope', 'carbon', 'renewable', 'supplier',
+         'facilities', 'market', 'based', 'location', 'total', 'water', 'waste',
+         'report', 'operational', 'intensity', 'reduction', 'target', 'the',
+         'and', 'of', 'in', 'our', 'data', 'centers', 'offices', 'travel']
+
+def make_pdf(pages=1, words=200, rows=10, cols=5, lines=True, fonts=2, seed=0,
+            sections=0, outline=False, named_dests=False, overprint=0, rules=0):
+    """
+    Return the bytes of a pdf where each page has a title, paragraphs then a
+    table of numbers under a header of years.
+    :param words: number of paragraph words per page.
+    :param rows/cols: table data rows/cols (plus a header row/label col).
+    :param lines: draw ruling lines around every table cell (otherwise just
+    the horizontal rules above and below the header).
+    :param fonts: number of distinct fonts to cycle through the paragraphs.
+    :param sections: number of headings to split each page's paragraphs by.
+    :param outline: add a bookmark for every page title and heading.
+    :param named_dests: bookmarks point at named rather than explicit
+    destinations.
+    :param overprint: times to redraw each paragraph line at a small offset
+    (faked bold).
+    :param rules: number of extra horizontal ruling lines (a ruled notes
+    area under the table) - scales the line work independently of the text.
+    """
+    rnd = random.Random(seed)
+    fonts = FONTS[:max(1, min(fonts, len(FONTS)))]
+    out = [make_page(rnd, words, rows, cols, lines, len(fonts), i, sections,
+                                        overprint, rules) for i in range(pages)]
+    marks = [(i, title, top) for i, x in enumerate(out) for title, top in x[2]]
+    return write_pdf([x[:2] for x in out], fonts, marks if outline else None,
+                                                                named_dests)
+
+def make_page(rnd, words, rows, cols, lines, n_fonts, page_i, sections=0,
+                                                        overprint=0, rules=0):
+    """
+    Return (content stream, page height, [(heading, top y)]) for one page.
+    """
+    ops, x0, x1 = [], 72, 540
+    para_lines = layout_words([rnd.choice(VOCAB) for x in range(words)], x1 - x0)
+
+    lbl_w, col_w, row_h, rule_h = 150, 70, 16, 4
+    tbl_h = (rows + 1) * row_h
+    height = max(792, 72 + 30 + 14 * len(para_lines) + 30 * sections + 40 +
+                                        tbl_h + (20 + rule_h * rules) + 72)
+
+    y = height - 72
+    title = f'Sustainability report page {page_i + 1}'
+    ops.append(text(x0, y, title, n_fonts - 1, 16))
+    marks = [(title, y + 16)]
+    y -= 30
+
+    per_section = -(-len(para_lines) // sections) if sections else 0
+    for i, line in enumerate(para_lines):
+        if per_section and i % per_section == 0:
+            y -= 10
+            heading = f'Section {page_i + 1}.{i // per_section + 1}'
+            ops.append(text(x0, y, heading, n_fonts - 1, 12))
+            marks.append((heading, y + 12))
+            y -= 20
+        font = (i // 8) % n_fonts  # Change font every paragraph of 8 lines
+        ops.append(text(x0, y, line, font, 10))
+        for k in range(overprint):
+            ops.append(text(x0 + 0.2 * (k + 1), y, line, font, 10))
+        y -= 14
+
+    y -= 40
+    ops.append(text(x0, y + 8, f'Table {page_i + 1}: Emissions (mtCO2e)', 0, 10))
+    top = y - 6
+    tbl_x1 = x0 + lbl_w + cols * col_w
+    for j in range(cols):
+        ops.append(text(x0 + lbl_w + j * col_w + 20, top - 12,
+                                                str(2019 - j), 0, 9))
+    for i in range(rows):
+        row_y = top - (i + 2) * row_h + 4
+        ops.append(text(x0 + 2, row_y, f'{rnd.choice(VOCAB)} {i + 1}', 0, 9))
+        for j in range(cols):
+            val = f'{rnd.randint(0, 10 ** rnd.randint(1, 7)):,}'
+            ops.append(text(x0 + lbl_w + (j + 1) * col_w - 6 - 5 * len(val),
+                                                            row_y, val, 0, 9))
+
+    bottom = top - tbl_h
+    hs = [top, top - row_h] + ([top - (i + 2) * row_h for i in range(rows)]
+                                                    if lines else [bottom])
+    for ln_y in hs:
+        ops.append(f'{x0} {ln_y} m {tbl_x1} {ln_y} l S')
+    if lines:
+        for ln_x in [x0, x0 + lbl_w] + [x0 + lbl_w + (j + 1) * col_w
+                                                        for j in range(cols)]:
+            ops.append(f'{ln_x} {bottom} m {ln_x} {top} l S')
+    for i in range(rules):
+        ln_y = bottom - 20 - i * rule_h
+        ops.append(f'{x0} {ln_y} m {tbl_x1} {ln_y} l S')
+
+    return '\n'.join(ops), height, marks
+
+def layout_words(words, width, char_w=5):
+    """
+    Wrap the words into lines (approximate widths are fine here).
+    """
+    out, line = [], ''
+    for word in words:
+        if line and (len(line) + len(word) + 1) * char_w > width:
+            out.append(line)
+            line = ''
+        line = f'{line} {word}' if line else word
+    return out + [line] if line else out
+
+def text(x, y, txt, font, size):
+    txt = txt.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+    return f'BT /F{font} {size} Tf {x} {y} Td ({txt}) Tj ET'
+
+def write_pdf(streams, fonts, marks=None, named_dests=False):
+    """
+    Serialise the page content streams into a complete pdf.
+    :param marks: optional (page index, title, top y) for a flat outline.
+    """
+    objs = {1: '<< /Type /Catalog /Pages 2 0 R >>'}
+
+    font_ids = {}
+    for i, name in enumerate(fonts):
+        font_ids[i] = 3 + i
+        objs[3 + i] = f'<< /Type /Font /Subtype /Type1 /BaseFont /{name} ' \
+                                        f'/Encoding /WinAnsiEncoding >>'
+    font_res = ' '.join([f'/F{k} {v} 0 R' for k, v in font_ids.items()])
+
+    kids = []
+    n = 3 + len(fonts)
+    for content, height in streams:
+        data = content.encode('latin-1')
+        objs[n] = f'<< /Length {len(data)} >>\nstream\n'.encode() + data + \
+                                                            b'\nendstream'
+        objs[n + 1] = f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 ' \
+                      f'{height}] /Resources << /Font << {font_res} >> >> ' \
+                      f'/Contents {n} 0 R >>'
+        kids.append(f'{n + 1} 0 R')
+        n += 2
+    objs[2] = f'<< /Type /Pages /Kids [{" ".join(kids)}] /Count {len(kids)} >>'
+
+    if marks:
+        root, first, last = n, n + 1, n + len(marks)
+        dests = []
+        for k, (i, title, top) in enumerate(marks):
+            dest = f'[{kids[i]} /XYZ 0 {top} null]'
+            if named_dests:
+                dests.append(f'/s{k} {dest}')
+                dest = f'/s{k}'
+            links = (f' /Prev {first + k - 1} 0 R' if k else '') + \
+                    (f' /Next {first + k + 1} 0 R' if first + k < last else '')
+            objs[first + k] = f'<< /Title ({title}) /Parent {root} 0 R ' \
+                              f'/Dest {dest}{links} >>'
+        objs[root] = f'<< /Type /Outlines /First {first} 0 R /Last {last} 0 R ' \
+                     f'/Count {len(marks)} >>'
+        objs[1] = f'<< /Type /Catalog /Pages 2 0 R /Outlines {root} 0 R' + \
+                  (f' /Dests << {" ".join(dests)} >>' if dests else '') + ' >>'
+
+    out, offsets = bytearray(b'%PDF-1.4\n'), {}
+    for k in sorted(objs):
+        body = objs[k] if isinstance(objs[k], bytes) else objs[k].encode()
+        offsets[k] = len(out)
+        out += f'{k} 0 obj\n'.encode() + body + b'\nendobj\n'
+
+    xref = len(out)
+    out += f'xref\n0 {len(objs) + 1}\n0000000000 65535 f \n'.encode()
+    for k in sorted(objs):
+        out += f'{offsets[k]:010d} 00000 n \n'.encode()
+    out += f'trailer\n<< /Size {len(objs) + 1} /Root 1 0 R >>\n' \
+           f'startxref\n{xref}\n%%EOF\n'.encode()
+    return bytes(out)
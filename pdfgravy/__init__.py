@@ -1 +1,33 @@
-from pdfgravy.pdf import Pdf, PdfExtract
\ No newline at end of file
+"""
+Top-level API - the submodules (and pdfminer/numpy with them) are only
+imported on first use so that `import pdfgravy` stays cheap.
+"""
+import importlib
+
+# Public name --> submodule defining it
+_EXPORTS = {
+    'Pdf': 'pdf',
+    'PdfExtract': 'pdf',
+    'AsyncPdf': 'aio',
+    'open_pdf': 'aio',
+    'InterpreterContext': 'utils'
+}
+
+__all__ = list(_EXPORTS)  # Not open - a star import would shadow the builtin
+
+def open(f, user_settings={}, **kwargs):
+    """
+    Load the pdf (path or bytes) - shorthand for pdfgravy.Pdf(...).
+    """
+    from .pdf import Pdf
+    return Pdf(f, user_settings, **kwargs)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    val = getattr(importlib.import_module(f'.{_EXPORTS[name]}', __name__), name)
+    globals()[name] = val  # Only resolved once
+    return val
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
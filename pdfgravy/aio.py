@@ -0,0 +1,145 @@
+"""
+asyncio front-end which keeps pdfminer/Page work off the event loop.
+
+    pdf = await pdfgravy.aio.open_pdf(data)
+    async for page in pdf.aiter_pages():
+        ...
+
+A document's pages come from one pdfminer generator so are interpreted one
+at a time - the concurrency is across documents sharing a Runner (by default
+the module-level one from get_runner).
+"""
+from concurrent.futures import ThreadPoolExecutor
+from .pdf import Pdf
+from .instrument import get_profiler
+import threading
+import asyncio
+import weakref
+
+class Runner:
+
+    """
+    Executor plus concurrency limit - share one between documents to cap the
+    total amount of extraction work in flight.
+    """
+
+    def __init__(self, workers=4, executor=None):
+        """
+        :param workers: max number of pages being processed at once (by
+        different documents - each document's pages are processed in turn).
+        :param executor: optional executor - defaults to a thread pool as the
+        page generators/objects cannot be shipped to other processes.
+        """
+        self.workers = workers
+        self.executor = executor or ThreadPoolExecutor(workers)
+        self.slots = weakref.WeakKeyDictionary()  # Event loop --> Semaphore
+
+    async def run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        if loop not in self.slots:
+            self.slots[loop] = asyncio.Semaphore(self.workers)
+        async with self.slots[loop]:
+            return await loop.run_in_executor(self.executor, fn, *args)
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+class AsyncPdf(Pdf):
+
+    """
+    Pdf whose pages are interpreted in an executor and delivered one by one.
+    """
+
+    def __init__(self, f, user_settings={}, runner=None, interpreter=None,
+                                                                workers=None):
+        """
+        Store the source only - nothing is interpreted until iteration.
+        :param runner: Runner to share (default the module-level one).
+        :param workers: create a Runner of this size for this document alone
+        instead - closed once the document is loaded.
+        """
+        self.settings = self.Settings(user_settings)
+        self.profiler = get_profiler(self.settings['profile'])
+        self.own_runner = runner is None and bool(workers)
+        if self.own_runner:
+            self.runner = Runner(workers)
+        else:
+            self.runner = runner if runner else get_runner()
+        self._loading = False
+
+        self.pages = []
+        self._f = f
+        self._interpreter = interpreter
+
+    async def aiter_pages(self):
+        """
+        Yield each page as soon as it has been processed in the executor.
+        """
+        pages = self.load_pages(self._f, self._interpreter)
+        lock = threading.Lock()  # Generator must only be driven by one thread
+
+        def step():
+            with lock:
+                return next(pages, None)
+
+        def close():
+            with lock:
+                pages.close()  # Closes the underlying stream
+
+        try:
+            while True:
+                page = await self.runner.run(step)
+                if page is None:
+                    break
+                self.pages.append(page)
+                yield page
+        finally:
+            # Cancelled steps keep running in their thread so close after them
+            self.runner.executor.submit(close)
+            if not self._loading:
+                self.close()
+
+    async def load(self):
+        """
+        Process every page then aggregate doc-level words/lines/fonts.
+        """
+        self._loading = True
+        pages = self.aiter_pages()
+        try:
+            async for _ in pages:
+                pass
+            await self.runner.run(self.load_elems)
+        finally:
+            await pages.aclose()  # Stream closed before any runner shutdown
+            self.close()
+
+        return self
+
+    def close(self):
+        """
+        Shut down the runner if it was created for this document (queued
+        work still finishes).
+        """
+        if self.own_runner:
+            self.runner.close()
+
+_runner = None  # Shared by the documents opened without a runner
+
+def get_runner():
+    """
+    Return the module-level Runner (created on first use).
+    """
+    global _runner
+    if _runner is None:
+        _runner = Runner()
+    return _runner
+
+async def open_pdf(f, user_settings={}, workers=None, runner=None):
+    """
+    Open the pdf for asynchronous processing.
+    :param workers: size of a Runner for this document alone - only useful
+    to cap it separately as its own pages are processed in turn.
+    :param runner: Runner to share (default the module-level one).
+    :return: an AsyncPdf - iterate aiter_pages() or await load().
+    """
+    return AsyncPdf(f, user_settings, runner, workers=workers)
@@ -0,0 +1,75 @@
+"""
+Per-page limits so a single pathological page (e.g. a vector map with 200k
+path segments) can't stall a whole document - see the Pdf settings
+'page_timeout', 'max_objects' and 'budget_action'.
+
+The clock is checked between the page building stages and on every pass of
+the long loops (the word sort, and the header split of extract_tables which
+gets the same allowance again). Anything else e.g. a table's lazy spoke
+analysis runs to completion, so page_timeout is not a hard bound.
+"""
+import time
+
+# What happens to a page over budget:
+#   skip     - the page is kept but has no elements
+#   truncate - the page is built from what was interpreted before the limit
+#              (a limit hit after interpretation drops the remaining stages)
+#   degrade  - raw chars only i.e. no words, lines or table analysis
+ACTIONS = ['skip', 'truncate', 'degrade']
+
+class BudgetExceeded(Exception):
+
+    def __init__(self, limit, maximum, value, stage):
+        super().__init__(f'Page {limit} budget of {maximum} exceeded during '
+                                                        f'{stage} ({value})')
+        self.limit = limit
+        self.maximum = maximum
+        self.value = value
+        self.stage = stage
+
+class Budget:
+
+    """
+    Clock (started on creation) and object allowance for one page.
+    """
+
+    def __init__(self, timeout=None, max_objects=None, action='degrade'):
+        """
+        :param timeout: seconds allowed to interpret and build the page.
+        :param max_objects: chars/paths/images the device may create.
+        :param action: one of ACTIONS.
+        """
+        if action not in ACTIONS:
+            raise ValueError(f'Unrecognized budget action: {action}')
+
+        self.timeout = timeout
+        self.max_objects = max_objects
+        self.action = action
+        self.start = time.perf_counter()
+        self.deadline = self.start + timeout if timeout else None
+
+    def __bool__(self):
+        return bool(self.timeout or self.max_objects)
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    def check(self, stage, objects=None):
+        """
+        Raise BudgetExceeded if the page is out of time (or objects).
+        """
+        if self.max_objects and objects is not None and \
+                                                objects > self.max_objects:
+            raise BudgetExceeded('objects', self.max_objects, objects, stage)
+        if self.deadline and time.perf_counter() > self.deadline:
+            raise BudgetExceeded('time', self.timeout, round(self.elapsed, 3),
+                                                                        stage)
+
+    def record(self, page_no, err):
+        """
+        Return the structured (JSON-friendly) record of the breach.
+        """
+        return {'page': page_no, 'limit': err.limit, 'max': err.maximum,
+                'value': err.value, 'stage': err.stage, 'action': self.action,
+                'elapsed': round(self.elapsed, 3)}
@@ -0,0 +1,124 @@
+"""
+Optional in-process LRU cache for parsed pdfs and extracted tables.
+"""
+from collections import OrderedDict
+from .table import Table
+from .pdf import Pdf
+import hashlib
+import json
+
+ELEM_BYTES = 4096  # Rough memory footprint of one ingested page object
+COMPACT_BYTES = 512  # ... of one char/line of a compacted page
+SPOKE_BYTES = 8192  # ... of one resolved spoke plus its share of the cells
+
+def settings_key(settings):
+    """
+    Serialise the effective settings into a stable/hashable key.
+    """
+    def default(x):
+        return sorted(x) if isinstance(x, (set, frozenset)) else repr(x)
+    return json.dumps(settings, sort_keys=True, default=default)
+
+def approx_size(obj):
+    """
+    Estimate the memory held by a cached pdf/table collection.
+    """
+    if isinstance(obj, Pdf):
+        return ELEM_BYTES * sum([len(x.objects) for x in obj.pages])
+    # Tables are stored resolved along with their own compacted page
+    page = next(iter(obj.values())).page if obj else None
+    elems = sum([len(x) for x in page.words]) + len(page.lines) if page else 0
+    spokes = sum([len(getattr(x, '_spokes', [])) for x in obj.values()])
+    return 1024 + COMPACT_BYTES * elems + SPOKE_BYTES * spokes
+
+class ResultCache:
+
+    """
+    Cache keyed by document hash plus the effective Pdf/Table settings. Page
+    parses and tables are stored separately so that changing the table
+    settings does not throw away the (expensive) page parse.
+    """
+
+    def __init__(self, max_bytes=512 * 2**20, size_fn=approx_size):
+        """
+        :param max_bytes: (approximate) total size before LRU eviction.
+        :param size_fn: function estimating the size of a cached value.
+        """
+        self.max_bytes = max_bytes
+        self.size_fn = size_fn
+        self.size = 0
+        self.hits, self.misses = 0, 0
+        self._entries = OrderedDict()  # key --> (value, size)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, load):
+        """
+        Return the cached value for the key - calling load() on a miss.
+        """
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+        self.misses += 1
+        val = load()
+        size = self.size_fn(val)
+        if size > self.max_bytes:
+            return val  # Never evict everything for a value too big to keep
+
+        self._entries[key] = (val, size)
+        self.size += size
+        while self.size > self.max_bytes:
+            _, (_, old_size) = self._entries.popitem(last=False)
+            self.size -= old_size
+        return val
+
+    def get_pdf(self, f, user_settings={}, interpreter=None):
+        """
+        Load the pdf (path or bytes) unless already cached with same settings.
+        """
+        if isinstance(f, str):
+            with open(f, 'rb') as stream:
+                f = stream.read()
+        digest = hashlib.sha1(f).hexdigest()
+
+        key = ('pdf', digest, settings_key(Pdf.Settings(user_settings)))
+        pdf = self.get(key, lambda: Pdf(f, user_settings, interpreter))
+        pdf.cache_key = key
+        return pdf
+
+    def extract_tables(self, pdf, page, user_settings={}):
+        """
+        Cached equivalent of page.extract_tables for a pdf from get_pdf - the
+        tables are found on a compacted copy of the page (so they keep nothing
+        of the cached pdf alive) and resolved up front to be sized as stored.
+        A table whose spokes fail has the failure in tbl.error.
+        """
+        settings = settings_key(Table.Settings(user_settings))
+        key = ('tables', pdf.cache_key, page.page_no, settings)
+
+        def load():
+            copy = page.compact()
+            tbls = copy.extract_tables(user_settings)
+            for tbl in tbls.values():
+                try:
+                    tbl.cells
+                except Exception as e:
+                    tbl.error = f'{type(e).__name__}: {e}'
+            if not any([x.error for x in tbls.values()]):
+                copy.__dict__.pop('grids', None)  # Only needed to retry spokes
+            return tbls
+        return self.get(key, load)
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses,
+                        'entries': len(self._entries), 'bytes': self.size}
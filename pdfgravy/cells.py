@@ -0,0 +1,148 @@
+from .words import Words
+import numpy as np
+import bisect
+import re
+
+# One cell per line - optional symbol prefix, sign/accounting brackets, number
+# (with thousands separators), percent sign then unit suffix (digits only
+# straight after a letter e.g. m3, tCO2e - so '10 20' is still no number)
+NUM_RE = re.compile(r'^[ \t]*(?P<pre>[^\w\s(+\-\u2212\u2013.]*)[ \t]*(?P<open>\()?'
+                    r'(?P<sign>[+\-\u2212\u2013])?[ \t]*'
+                    r'(?P<num>\d[\d,]*(?:\.\d+)?|\.\d+)[ \t]*(?P<pct>%)?[ \t]*'
+                    r'(?P<close>\))?[ \t]*'
+                    r'(?P<post>(?:[^\d\n]|(?<=[^\W\d])\d+)*?)[ \t]*$', re.M)
+
+class Cells:
+
+    """
+    Row x column cells of a table built once from the extents of its spokes -
+    rows (top down) from horizontal spokes and cols from vertical spokes.
+    """
+
+    def __init__(self, spokes, words):
+        """
+        Index the spoke extents then drop each word into its cell.
+        """
+        self.cols = sorted([x for x in spokes if x.orientation == 'v'],
+                                                        key=lambda x: x.x0)
+        self.rows = sorted([x for x in spokes if x.orientation == 'h'],
+                                                        key=lambda x: -x.y1)
+
+        self.col_spans = Intervals([(x.x0, x.x1) for x in self.cols])
+        self.row_spans = Intervals([(x.y0, x.y1) for x in self.rows])
+
+        self.matrix = [[Words() for x in self.cols] for y in self.rows]
+        for word in words:
+            cell = self.word_to_cell(word)
+            if cell is not None:
+                self.matrix[cell[0]][cell[1]].append(word)
+        for cell_words in self.values():
+            if cell_words:
+                cell_words.set_bbox()
+
+    def __getitem__(self, key):
+        i, j = key
+        return self.matrix[i][j]
+
+    def __len__(self):
+        return len(self.rows) * len(self.cols)
+
+    @property
+    def shape(self):
+        return len(self.rows), len(self.cols)
+
+    def values(self):
+        return [x for row in self.matrix for x in row]
+
+    def lookup(self, x, y):
+        """
+        Return the (row, col) index of the cell containing the point (if any).
+        """
+        i, j = self.row_spans.find(y), self.col_spans.find(x)
+        if i is None or j is None:
+            return None
+        return i, j
+
+    def word_to_cell(self, word):
+        """
+        Return the (row, col) index of the cell holding the word's midpoint.
+        """
+        return self.lookup(word.midx, word.midy)
+
+    def get(self, x, y):
+        """
+        Return the Words in the cell containing the point (if any).
+        """
+        cell = self.lookup(x, y)
+        return self[cell] if cell is not None else None
+
+    def to_arrays(self):
+        """
+        Parse every cell at once into typed (rows x cols) arrays.
+        """
+        out = parse_numbers([x.text for x in self.values()])
+        for k, v in out.items():
+            out[k] = v.reshape(self.shape)
+
+        out['rows'] = [x.title for x in self.rows]
+        out['cols'] = [x.title for x in self.cols]
+        return out
+
+class Intervals:
+
+    """
+    Sorted breakpoints over (possibly overlapping) spans for bisect lookups.
+    """
+
+    def __init__(self, spans):
+        self.order = sorted(range(len(spans)), key=lambda i: spans[i][0])
+        self.los = [spans[i][0] for i in self.order]
+        self.his = [spans[i][1] for i in self.order]
+
+        # Running max of the span ends to know when to stop looking back
+        self.reach = []
+        for hi in self.his:
+            self.reach.append(max(hi, self.reach[-1]) if self.reach else hi)
+
+    def find(self, v):
+        """
+        Return the index (in the original order) of the span containing v.
+        """
+        k = bisect.bisect_right(self.los, v) - 1
+        while k >= 0 and self.reach[k] >= v:
+            if self.his[k] >= v:
+                return self.order[k]
+            k -= 1
+        return None
+
+def parse_numbers(texts):
+    """
+    Parse numeric cell texts (e.g. '105,940', '93%', '(1.4)', '-') in one pass
+    over the newline-joined buffer rather than a regex call per cell.
+    :return: dict of float64 values, missing/percent masks and unit strings.
+    """
+    buf = '\n'.join([x.replace('\n', ' ') for x in texts])
+    starts = np.cumsum([0] + [len(x) + 1 for x in texts[:-1]])
+
+    matches = list(NUM_RE.finditer(buf))
+    idx = np.searchsorted(starts, [x.start() for x in matches], side='right') - 1
+    nums = np.array([x['num'].replace(',', '') for x in matches], dtype=str)
+
+    values = np.full(len(texts), np.nan)
+    values[idx] = nums.astype(np.float64) if len(nums) else []
+
+    neg = np.array([bool(x['sign'] and x['sign'] != '+') or
+                    bool(x['open'] and x['close']) for x in matches], dtype=bool)
+    values[idx[neg]] *= -1
+
+    missing = np.ones(len(texts), dtype=bool)
+    missing[idx] = False
+
+    percent = np.zeros(len(texts), dtype=bool)
+    percent[idx] = [bool(x['pct']) for x in matches]
+
+    units = np.full(len(texts), '', dtype=object)
+    units[idx] = [(x['pre'] + x['post']).strip() for x in matches]
+
+    return {'values': values, 'missing': missing, 'percent': percent,
+                                                                'units': units}
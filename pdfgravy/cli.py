@@ -0,0 +1,234 @@
+"""
+Command-line batch extraction.
+
+    pdfgravy words reports/*.pdf --workers 4 > words.jsonl
+    pdfgravy tables reports/ --pages 1-3 --format csv --output out/
+    pdfgravy sections a.pdf --headers energy,water
+
+Each document's rows are written as soon as it finishes (in completion order
+when --workers > 1). Files which fail are listed on stderr at the end and the
+exit code is then 1. A table whose spokes can't be found only gets a single
+row with its 'error' set.
+"""
+from .pdf import Pdf
+from . import utils
+from pdfminer.pdftypes import resolve1
+from pdfminer.utils import decode_text
+import argparse
+import glob
+import json
+import csv
+import sys
+import os
+
+# Row fields by subcommand (the csv columns)
+FIELDS = {
+    'words': ['file', 'page', 'text', 'font', 'x0', 'x1', 'y0', 'y1'],
+    'tables': ['file', 'page', 'table', 'title', 'row', 'col', 'row_title',
+                                                'col_title', 'text', 'error'],
+    'sections': ['file', 'section', 'title', 'header', 'y0', 'y1', 'text'],
+    'info': ['file', 'pages', 'bookmarks', 'title', 'author', 'producer']
+}
+
+def run_file(job):
+    """
+    Process one document.
+    :param job: (subcommand, path, Pdf settings, subcommand args).
+    :return: (path, rows, error message or None).
+    """
+    kind, path, settings, args = job
+    try:
+        if kind == 'info':
+            pdf = Pdf.inspect(path)  # No pages need interpreting
+        else:
+            pdf = Pdf(path, settings, interpreter=utils.worker_interpreter())
+        return path, list(ROWS[kind](pdf, path, args)), None
+    except Exception as e:
+        return path, [], f'{type(e).__name__}: {e}'
+
+def word_rows(pdf, path, args):
+    for page in pdf.pages:
+        off = page.y_offset  # Words were moved into document y
+        for x in page.words:
+            yield {'file': path, 'page': page.page_no, 'text': x.text,
+                   'font': x.font, 'x0': x.x0, 'x1': x.x1,
+                   'y0': x.y0 - off, 'y1': x.y1 - off}
+
+def table_rows(pdf, path, args):
+    for page in pdf.pages:
+        for i, tbl in page.extract_tables(args).items():
+            try:
+                cells = tbl.cells
+            except Exception as e:
+                # One row for the table whose spokes failed - not the file
+                tbl.error = f'{type(e).__name__}: {e}'
+                yield {'file': path, 'page': page.page_no, 'table': i,
+                       'title': tbl.title, 'error': tbl.error}
+                continue
+            for r, row in enumerate(cells.rows):
+                for c, col in enumerate(cells.cols):
+                    words = cells[r, c]
+                    if not words:
+                        continue
+                    yield {'file': path, 'page': page.page_no, 'table': i,
+                           'title': tbl.title, 'row': r, 'col': c,
+                           'row_title': row.title, 'col_title': col.title,
+                           'text': words.text}
+
+def section_rows(pdf, path, args):
+    for i, extract in enumerate(pdf.get_headed_sections(args)):
+        yield {'file': path, 'section': i, 'title': extract.title,
+               'header': extract.header.text,
+               'y0': extract.y0, 'y1': extract.y1,
+               'text': ' '.join([x.text for x in extract.words])}
+
+def info_rows(pdf, path, args):
+    info = {}
+    for item in pdf.info:
+        for k, v in item.items():
+            v = resolve1(v)
+            info[k.lower()] = decode_text(v) if isinstance(v, bytes) else v
+    yield {'file': path, 'pages': pdf.page_count, 'bookmarks': len(pdf.bmarks),
+           'title': info.get('title'), 'author': info.get('author'),
+           'producer': info.get('producer')}
+
+ROWS = {'words': word_rows, 'tables': table_rows, 'sections': section_rows,
+                                                        'info': info_rows}
+
+def find_pdfs(paths):
+    """
+    Expand the files, directories (searched recursively) and globs given.
+    """
+    out = []
+    for path in paths:
+        if os.path.isdir(path):
+            found = glob.glob(os.path.join(path, '**', '*.pdf'), recursive=True)
+        elif os.path.exists(path):
+            found = [path]
+        else:
+            found = glob.glob(path, recursive=True)
+        out.extend(sorted(found))
+    return list(dict.fromkeys(out))  # Drop repeats but keep the order
+
+def parse_pages(spec):
+    """
+    Convert e.g. '1,3-5' into [1, 3, 4, 5].
+    """
+    out = []
+    for part in spec.split(','):
+        lo, _, hi = part.partition('-')
+        out.extend(range(int(lo), int(hi or lo) + 1))
+    return out
+
+class Output:
+
+    """
+    Streams rows to stdout or to one file per document in a directory - the
+    files keep each pdf's path relative to root (so same-named pdfs in
+    different folders don't overwrite each other).
+    """
+
+    def __init__(self, kind, fmt, directory=None, stream=None, root=None):
+        self.kind = kind
+        self.fmt = fmt
+        self.directory = directory
+        self.root = root
+        self.stream = stream if stream else sys.stdout
+        self.header = True  # Only once when everything goes to one stream
+
+    def write(self, path, rows):
+        if self.directory is None:
+            self.dump(rows, self.stream)
+            self.stream.flush()
+            return
+        if self.root is None:
+            rel = os.path.basename(path)
+        else:
+            rel = os.path.relpath(os.path.abspath(path), self.root)
+        stem = os.path.splitext(rel)[0]
+        out = os.path.join(self.directory, f'{stem}.{self.kind}.{self.fmt}')
+        os.makedirs(os.path.dirname(out), exist_ok=True)
+        with open(out, 'w', newline='') as f:
+            self.header = True
+            self.dump(rows, f)
+
+    def dump(self, rows, f):
+        if self.fmt == 'jsonl':
+            for row in rows:
+                f.write(json.dumps(row, default=utils.json_default) + '\n')
+            return
+        writer = csv.DictWriter(f, FIELDS[self.kind])
+        if self.header:
+            writer.writeheader()
+            self.header = False
+        writer.writerows(rows)
+
+def run(kind, paths, settings={}, args=None, workers=1):
+    """
+    Process the documents - yielding (path, rows, error) as each finishes.
+    """
+    jobs = [(kind, x, settings, args) for x in paths]
+    if workers < 2 or len(jobs) < 2:
+        utils.init_worker()
+        yield from map(run_file, jobs)
+        return
+
+    from multiprocessing import Pool
+    with Pool(min(workers, len(jobs)),
+                            initializer=utils.init_worker) as pool:
+        yield from pool.imap_unordered(run_file, jobs)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='pdfgravy',
+                                     description='pdfgravy batch extraction')
+    commands = parser.add_subparsers(dest='kind', required=True)
+    for kind in FIELDS:
+        sub = commands.add_parser(kind)
+        sub.add_argument('paths', nargs='+', help='pdf files, directories or globs')
+        sub.add_argument('--workers', type=int, default=1)
+        sub.add_argument('--pages', type=parse_pages, help='e.g. 1,3-5')
+        sub.add_argument('--format', choices=['jsonl', 'csv'], default='jsonl')
+        sub.add_argument('--output', help='directory for one file per pdf '
+                                                        '(default stdout)')
+        sub.add_argument('--settings', default='{}', help='Pdf settings (JSON)')
+        if kind == 'tables':
+            sub.add_argument('--table-settings', default='{}',
+                                                help='Table settings (JSON)')
+        if kind == 'sections':
+            sub.add_argument('--headers', default='',
+                                        help='comma separated reference headers')
+    opts = parser.parse_args(argv)
+
+    settings = json.loads(opts.settings)
+    if opts.pages:
+        settings['pages'] = opts.pages
+    args = None
+    if opts.kind == 'tables':
+        args = json.loads(opts.table_settings)
+    elif opts.kind == 'sections':
+        args = [x for x in opts.headers.lower().split(',') if x]
+
+    paths = find_pdfs(opts.paths)
+    if not paths:
+        print('No pdfs found', file=sys.stderr)
+        return 1
+
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(x))
+                                                            for x in paths])
+    output = Output(opts.kind, opts.format, opts.output, root=root)
+    errors = {}
+    for path, rows, error in run(opts.kind, paths, settings, args, opts.workers):
+        if error:
+            errors[path] = error
+            continue
+        output.write(path, rows)
+
+    if errors:
+        print(f'{len(errors)} of {len(paths)} files failed:', file=sys.stderr)
+        for path, error in errors.items():
+            print(f'  {path}: {error}', file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,221 @@
+from pdfminer.converter import PDFPageAggregator
+from pdfminer.layout import LAParams, LTAnno, LTChar, LTContainer, \
+                                                        LTTextLineHorizontal
+
+LAPARAMS = LAParams(char_margin=2, line_margin=2, word_margin=0.2)
+
+COMPONENTS = {'words', 'lines'}
+
+class PageAggregator(PDFPageAggregator):
+
+    """
+    pdfminer device which only builds the layout objects that are needed.
+    """
+
+    def __init__(self, rsrcmgr, laparams=LAPARAMS):
+        super().__init__(rsrcmgr, laparams=laparams)
+        self.extract = None
+        self.native_lines = False
+        self.clip = None  # (x0, y0, x1, y1) of the current page if clipping
+        self.budget = None  # Budget of the current page (if limited)
+        self.n_objects = 0
+
+    def configure(self, extract=None, native_lines=False):
+        """
+        Select the components to build - None for everything.
+        :param native_lines: build text lines with group_lines instead of
+        pdfminer's (much slower) full layout analysis.
+        """
+        if extract is not None and not set(extract) <= COMPONENTS:
+            raise ValueError(f'Unrecognized extract component: {extract}')
+
+        self.extract = extract
+        self.native_lines = native_lines
+
+    def keeps(self, component):
+        return self.extract is None or component in self.extract
+
+    def in_clip(self, item, mid_only=False):
+        """
+        Return True if the item (or just its midpoint) falls in the clip box.
+        """
+        x0, y0, x1, y1 = self.clip
+        if mid_only:
+            midx, midy = (item.x0 + item.x1) / 2, (item.y0 + item.y1) / 2
+            return x0 <= midx <= x1 and y0 <= midy <= y1
+        return item.x1 >= x0 and item.x0 <= x1 and item.y1 >= y0 and item.y0 <= y1
+
+    def begin_page(self, page, ctm):
+        super().begin_page(page, ctm)
+        self.n_objects = 0
+
+    def charge(self):
+        """
+        Count one more object against the page budget - raises BudgetExceeded
+        (before the object is added) once it runs out.
+        """
+        self.n_objects += 1
+        self.budget.check('interpret', self.n_objects)
+
+    def abort_page(self, page, analyze=True):
+        """
+        Finish the page interrupted by BudgetExceeded with the objects so far.
+        :param analyze: run the layout analysis over the partial page.
+        """
+        while self._stack:
+            self.end_figure(None)
+
+        laparams = self.laparams
+        if not analyze:
+            self.laparams, native_lines = None, self.native_lines
+            self.native_lines = False
+        try:
+            self.end_page(page)
+        finally:
+            self.laparams = laparams
+            if not analyze:
+                self.native_lines = native_lines
+        return self.get_result()
+
+    def end_page(self, page):
+        if self.native_lines and self.keeps('words'):
+            self.cur_item._objs = group_lines(self.cur_item._objs, self.laparams)
+
+        # Layout analysis only groups text so skip it if words aren't wanted
+        laparams, self.laparams = self.laparams, self.laparams if \
+                    self.keeps('words') and not self.native_lines else None
+        try:
+            super().end_page(page)
+        finally:
+            self.laparams = laparams
+
+    def render_image(self, name, stream):
+        if self.extract is None:
+            if self.budget:
+                self.charge()
+            super().render_image(name, stream)
+        # Images are never used downstream so drop them when being selective
+
+    def paint_path(self, gstate, stroke, fill, evenodd, path):
+        # NB curves (used to find drawn bullets) also come from paths
+        if not self.keeps('lines'):
+            return
+        if self.budget:
+            self.charge()
+        if self.clip is None:
+            return super().paint_path(gstate, stroke, fill, evenodd, path)
+
+        # Complex paths can add several items so check everything new
+        objs = self.cur_item._objs
+        i = len(objs)
+        super().paint_path(gstate, stroke, fill, evenodd, path)
+        objs[i:] = [x for x in objs[i:] if self.in_clip(x)]
+
+    def render_char(self, matrix, font, fontsize, scaling, rise, cid, ncs,
+                                                                graphicstate):
+        if self.keeps('words') or font.is_vertical():
+            if self.budget:
+                self.charge()
+            adv = super().render_char(matrix, font, fontsize, scaling, rise,
+                                                    cid, ncs, graphicstate)
+            if self.clip and not self.in_clip(self.cur_item._objs[-1], True):
+                self.cur_item._objs.pop()  # Dropped before layout analysis
+            return adv
+
+        # Only the advance is needed to keep the text state moving
+        return font.char_width(cid) * fontsize * scaling
+
+def group_lines(objs, laparams=LAPARAMS):
+    """
+    Group loose chars into horizontal text lines with a sort-and-sweep rather
+    than pdfminer's pairwise layout analysis. Other objects pass through.
+    """
+    chars = [x for x in objs if isinstance(x, LTChar)]
+    out = [x for x in objs if not isinstance(x, LTChar)]
+
+    # Sweep down the page opening a new band when chars stop overlapping the
+    # first (highest) char of the current band
+    chars.sort(key=lambda x: -(x.y0 + x.y1))
+    bands = []
+    for char in chars:
+        if bands:
+            ref = bands[-1][0]
+            overlap = min(ref.y1, char.y1) - max(ref.y0, char.y0)
+            if overlap > laparams.line_overlap * min(ref.height, char.height):
+                bands[-1].append(char)
+                continue
+        bands.append([char])
+
+    # Then sweep across each band splitting wherever the gap is too wide
+    for band in bands:
+        band = strip_padding(sorted(band, key=lambda x: x.x0))
+        line = None
+        for char in band:
+            if line is not None:
+                prev = line._objs[-1]
+                if char.x0 - prev.x1 < max(char.width, prev.width) * \
+                                                        laparams.char_margin:
+                    line.add(char)  # Inserts word spaces by word_margin
+                    continue
+                line.analyze(laparams)
+                out.append(line)
+            line = LTTextLineHorizontal(laparams.word_margin)
+            line.add(char)
+        if line is not None:
+            line.analyze(laparams)
+            out.append(line)
+
+    return out
+
+def strip_padding(band):
+    """
+    Drop whitespace chars which sit on top of visible chars (e.g. padding
+    drawn separately in tables) as they no longer follow stream order.
+    """
+    out = []
+    for i, char in enumerate(band):
+        if char.get_text().isspace():
+            adj = [x for x in band[max(0, i-1):i+2] if x is not char]
+            if any([min(x.x1, char.x1) - max(x.x0, char.x0) > char.width / 2
+                            and not x.get_text().isspace() for x in adj]):
+                continue
+        out.append(char)
+    return out
+
+def dedupe_overprints(layout, tol=0.5):
+    """
+    Drop glyphs drawn again on top of themselves (e.g. faked bold) whether
+    redrawn within the same text line or as a separate run.
+    :param tol: max offset in points between a glyph and its duplicate.
+    :return: number of chars removed.
+    """
+    return drop_overprints(layout, {}, tol)
+
+def drop_overprints(item, seen, tol):
+    """
+    Remove the duplicates under the container - chars are hashed by text,
+    font and quantised x0/y0 so each is only compared with those in its own
+    and neighbouring buckets. Containers left without chars are dropped.
+    """
+    removed, out = 0, []
+    for obj in item._objs:
+        if isinstance(obj, LTChar):
+            qx, qy = round(obj.x0 / tol), round(obj.y0 / tol)
+            near = [x for dx in (-1, 0, 1) for dy in (-1, 0, 1) for x in
+                    seen.get((obj._text, obj.fontname, qx + dx, qy + dy), [])]
+            if any([abs(x.x0 - obj.x0) <= tol and abs(x.y0 - obj.y0) <= tol
+                                                            for x in near]):
+                removed += 1
+                continue
+            seen.setdefault((obj._text, obj.fontname, qx, qy), []).append(obj)
+        elif isinstance(obj, LTAnno):
+            if out and isinstance(out[-1], LTAnno):
+                continue  # Spacing left between removed duplicates
+        elif isinstance(obj, LTContainer):
+            n = drop_overprints(obj, seen, tol)
+            removed += n
+            if n and all([isinstance(x, LTAnno) for x in obj._objs]):
+                continue
+        out.append(obj)
+    item._objs = out
+    return removed
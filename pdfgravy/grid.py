@@ -4,6 +4,7 @@ from . import helper
 import statistics as stats
 from .words import Words
 from copy import copy
+import numpy as np
 
 class Grid:
 
@@ -11,9 +12,10 @@ class Grid:
     Parent class for conceptualisation of page area as matrix of edges/cells.
     """
 
-    def __init__(self, page, x0=None, x1=None, y0=None, y1=None):
+    def __init__(self, page, x0=None, x1=None, y0=None, y1=None, engine=None):
         """
         Store position and cut relevant features from page.
+        :param engine: optional GridEngine with precomputed page structures.
         """
         self.y1 = y1 if y1 else page.h
         self.y0 = y0 if y0 else 0
@@ -21,8 +23,13 @@ class Grid:
         self.x1 = x1 if x1 else page.w
         self.x0 = x0 if x0 else 0
 
-        self.words = self.get_fitted(page.words)
-        self.lines = self.get_fitted(page.lines)
+        self.engine = engine
+        if engine is not None:
+            self.words = engine.get_fitted('words', self)
+            self.lines = engine.get_fitted('lines', self)
+        else:
+            self.words = self.get_fitted(page.words)
+            self.lines = self.get_fitted(page.lines)
 
         if self.words:
             self.find_cols(5)
@@ -41,7 +48,7 @@ class Grid:
         Use multiple clustering and subsequent separation to find cols of words.
         """
         # Cluster words by multiple x pts (l/r/mid)
-        h_clusters, align = self.words.mega_cluster('horizontal', w_tol)
+        h_clusters, align = self.mega_cluster('horizontal', w_tol)
         h_clusters = Nest(*[x for y in h_clusters for x in y])
 
         # Then flatten and cluster the clusters with a wide tolerance to sort
@@ -49,8 +56,9 @@ class Grid:
 
         col_tol = stats.median([x.w for x in h_clusters]) / 2
 
-        fn = lambda x: x.agg(align, 'median')
-        self.cols = h_clusters.cluster(fn, col_tol)
+        meds = {id(x): x.agg(align, 'median') for x in h_clusters}
+        fn = lambda x, y: abs(meds[id(x)] - meds[id(y)]) <= col_tol
+        self.cols = h_clusters.cluster(fn)
 
         # Then take the largest of each to get one cluster for each column
         self.cols.apply_nested(Nest.get_sorted, len, 0, inv=True)
@@ -59,17 +67,26 @@ class Grid:
         """
         As above (get_cols) but slimmed and applied vertically for rows.
         """
-        rows, _ = self.words.mega_cluster('vertical', w_tol)
+        rows, _ = self.mega_cluster('vertical', w_tol)
         
         # Take the largest cluster of rows
         self.rows = rows.get_sorted(len, 0, inv=True)
 
+    def mega_cluster(self, orientation, tol):
+        """
+        Cluster the grid's words - restricting page-level clusters if possible.
+        """
+        if self.engine is not None:
+            return self.engine.mega_cluster(orientation, tol, self)
+        return self.words.mega_cluster(orientation, tol)
+
     def segment_col(self, col):
         """
         Segment a column by the horizontal position of words and lines within.
         """
         # Cluster words into rows with tolerance of roughly half normal spacing
-        rows = col.cluster(lambda x: x.midy, (col.y1 - col.y0) / len(col) / 2)
+        tol = (col.y1 - col.y0) / len(col) / 2
+        rows = col.cluster(lambda x, y: abs(x.midy - y.midy) <= tol)
         
         lns = self.lines_h.filter(Nested.chk_intersection, col, x_only=True)
         
@@ -102,4 +119,95 @@ class Grid:
     
     @helper.lazy_property
     def lines_v(self):
-        self._lines_v = self.lines.filter_attrs(orientation='v')
\ No newline at end of file
+        self._lines_v = self.lines.filter_attrs(orientation='v')
+
+class GridEngine:
+
+    """
+    Per-page store of coordinate arrays and alignment clusters from which
+    sub-region Grids are cut (and memoised) instead of being rebuilt.
+    """
+
+    VARS = {'horizontal': ['x0', 'x1', 'midx'], 'vertical': ['y0', 'y1', 'midy']}
+
+    def __init__(self, page):
+        self.page = page
+        self.elems = {'words': page.words, 'lines': page.lines}
+        self.coords = {}
+        for k, nest in self.elems.items():
+            self.coords[k] = np.array([[x.x0, x.x1, x.y0, x.y1] for x in nest],
+                                                    dtype=float).reshape(-1, 4)
+        self.clusters = {}  # (orientation, tol) --> {var: [[word idx]]}
+        self.grids = {}
+
+    def get(self, x0=None, x1=None, y0=None, y1=None):
+        """
+        Return the (memoised) Grid for the window.
+        """
+        key = (x0 if x0 else 0, x1 if x1 else self.page.w,
+               y0 if y0 else 0, y1 if y1 else self.page.h)
+        if key not in self.grids:
+            self.grids[key] = Grid(self.page, *key, engine=self)
+        return self.grids[key]
+
+    def get_mask(self, k, grid):
+        """
+        Vectorised equivalent of Nested.chk_intersection against the grid.
+        """
+        x0, x1, y0, y1 = self.coords[k].T
+        mask = np.ones(len(x0), dtype=bool)
+        if grid.x0:
+            mask &= x1 > grid.x0
+        if grid.x1:
+            mask &= x0 < grid.x1
+        if grid.y0:
+            mask &= y1 > grid.y0
+        if grid.y1:
+            mask &= y0 < grid.y1
+        return mask
+
+    def get_fitted(self, k, grid):
+        nest = self.elems[k]
+        idx = np.flatnonzero(self.get_mask(k, grid))
+        return nest.copy(_ls=[nest[i] for i in idx]).set_bbox()
+
+    def get_clusters(self, orientation, tol):
+        """
+        Cluster all the page's words once per orientation/tolerance.
+        """
+        key = (orientation, tol)
+        if key not in self.clusters:
+            words = self.elems['words']
+            self.clusters[key] = words.align_clusters(orientation, tol)
+        return self.clusters[key]
+
+    def mega_cluster(self, orientation, tol, grid):
+        """
+        Same output as Nest.mega_cluster but from restricting the page-level
+        clusters to the words inside the grid. Words outside the grid can
+        bridge gaps so each restricted cluster is split again wherever its
+        (already sorted) values leave a gap above the tolerance.
+        """
+        words = self.elems['words']
+        mask = self.get_mask('words', grid)
+        x0, x1, y0, y1 = self.coords['words'].T
+        vals = {'x0': x0, 'x1': x1, 'midx': (x0 + x1) / 2,
+                'y0': y0, 'y1': y1, 'midy': (y0 + y1) / 2}
+
+        out = Words()
+        max_len = 0
+        for var, clusters in self.get_clusters(orientation, tol).items():
+            parts = Words()
+            for cluster in clusters:
+                cluster = cluster[mask[cluster]]
+                if not len(cluster):
+                    continue
+                gaps = np.flatnonzero(np.diff(vals[var][cluster]) > tol) + 1
+                for part in np.split(cluster, gaps):
+                    if len(part) > max_len:
+                        max_len = len(part)
+                        align = var
+                    parts.addtwigs(Words(*[words[i] for i in part]))
+            out.addtwigs(parts)
+
+        return out, align
@@ -33,7 +33,13 @@ def store_attrs(tar, ref, non_sys=True):
     Attach the attributes from the mapping/ref object to the target object.
     """
     if not isinstance(ref, dict):
-        ref = {k:getattr(ref, k) for k in dir(ref)}
+        attrs = {}
+        for k in dir(ref):
+            try:
+                attrs[k] = getattr(ref, k)
+            except Exception:
+                pass  # True for properties which can't evaluate (yet)
+        ref = attrs
     
     for attr, val in ref.items():
         if (non_sys and attr.startswith('__')) or not val:
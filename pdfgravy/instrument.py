@@ -0,0 +1,231 @@
+"""
+Opt-in per-page/per-stage timings and element counts.
+
+Pass {'profile': True} (or any object with a compatible span() method) in
+the Pdf settings then read pdf.profiler.summary() or save_trace(path) for a
+Chrome trace (chrome://tracing or Perfetto).
+
+For finer detail NestTracer counts the Nest operations made from each call
+site while active:
+
+    with NestTracer() as tracer:
+        pdf = Pdf(path)
+    print(tracer.format_report())
+"""
+from collections import defaultdict
+from .nest import Nest
+import functools
+import threading
+import json
+import time
+import sys
+import os
+
+class Profiler:
+
+    """
+    Records one event per stage run with its duration and counts.
+    """
+
+    def __init__(self):
+        self.events = []
+        self.origin = time.perf_counter()
+
+    def span(self, name, page=None):
+        """
+        Context manager timing the stage - counts are set on the span itself
+        e.g. `span['words'] = len(words)`.
+        """
+        return Span(self, name, page)
+
+    def summary(self):
+        """
+        Return per-stage totals (time and counts) plus per-page breakdowns.
+        """
+        stages, pages = {}, {}
+        for event in self.events:
+            stage = stages.setdefault(event['name'],
+                                    {'calls': 0, 'total': 0, 'max': 0})
+            stage['calls'] += 1
+            stage['total'] += event['dur']
+            stage['max'] = max(stage['max'], event['dur'])
+            for k, v in event['counts'].items():
+                stage[k] = stage.get(k, 0) + v
+
+            if event['page'] is not None:
+                page = pages.setdefault(event['page'], {})
+                page[event['name']] = page.get(event['name'], 0) + event['dur']
+
+        return {'stages': stages, 'pages': pages}
+
+    def to_trace(self):
+        """
+        Return the events in Chrome trace-event format.
+        """
+        out = []
+        for event in self.events:
+            args = dict(event['counts'])
+            if event['page'] is not None:
+                args['page'] = event['page']
+            out.append({'name': event['name'], 'ph': 'X', 'cat': 'pdfgravy',
+                        'ts': event['ts'] * 1e6, 'dur': event['dur'] * 1e6,
+                        'pid': os.getpid(), 'tid': event['tid'], 'args': args})
+        return {'traceEvents': out, 'displayTimeUnit': 'ms'}
+
+    def save_trace(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_trace(), f)
+
+class Span:
+
+    def __init__(self, profiler, name, page):
+        self.profiler = profiler
+        self.name = name
+        self.page = page
+        self.counts = {}
+
+    def __setitem__(self, key, val):
+        self.counts[key] = val
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        self.profiler.events.append({
+            'name': self.name, 'page': self.page, 'counts': self.counts,
+            'ts': self.start - self.profiler.origin, 'dur': end - self.start,
+            'tid': threading.get_ident()})
+
+class NullProfiler:
+
+    """
+    Default (disabled) profiler - every span is the same no-op object.
+    """
+
+    def span(self, name, page=None):
+        return NULL_SPAN
+
+    def summary(self):
+        return {'stages': {}, 'pages': {}}
+
+    def to_trace(self):
+        return {'traceEvents': [], 'displayTimeUnit': 'ms'}
+
+class NullSpan:
+
+    def __setitem__(self, key, val):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+NULL = NullProfiler()
+NULL_SPAN = NullSpan()
+
+def timed(name, count=None):
+    """
+    Run the decorated Pdf/Page method inside a span of the object's profiler.
+    :param count: optional fn(result) --> dict of counts to record.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def inner(obj, *args, **kwargs):
+            profiler = getattr(obj, 'profiler', NULL)
+            if profiler is NULL:
+                return func(obj, *args, **kwargs)
+            with profiler.span(name, getattr(obj, 'page_no', None)) as span:
+                out = func(obj, *args, **kwargs)
+                for k, v in (count(out) if count else {}).items():
+                    span[k] = v
+            return out
+        return inner
+    return decorator
+
+def get_profiler(setting):
+    """
+    Resolve the 'profile' setting - True for a new Profiler, a hook object
+    is used as is and anything falsy disables profiling.
+    """
+    if not setting:
+        return NULL
+    if setting is True:
+        return Profiler()
+    return setting
+
+
+class NestTracer:
+
+    """
+    Counts calls plus input/output sizes of Nest operations per call site
+    (the first caller outside nest.py). Nest is only patched while active.
+    """
+
+    OPS = ['filter', 'filter_attrs', 'cluster', 'neg_cluster', 'split',
+           'slice', 'set_bbox', '__getitem__', 'copy', 'denest', 'snap',
+           'get_sorted', 'agg', 'basic_sort', 'flexi_sort', 'mega_cluster',
+           'apply_nested', 'get_delta', 'split_y', 'slot_y', 'fill_y_gaps']
+
+    def __init__(self, ops=OPS):
+        self.ops = ops
+        self.stats = defaultdict(lambda: {'calls': 0, 'in': 0, 'out': 0})
+        self._originals = {}
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self):
+        for op in self.ops:
+            self._originals[op] = Nest.__dict__[op]
+            setattr(Nest, op, self.wrap(op, Nest.__dict__[op]))
+
+    def stop(self):
+        for op, func in self._originals.items():
+            setattr(Nest, op, func)
+        self._originals = {}
+
+    def wrap(self, op, func):
+        stats = self.stats
+        def inner(nest, *args, **kwargs):
+            if op == '__getitem__' and not isinstance(args[0], slice):
+                return func(nest, *args, **kwargs)  # Only count slices
+            out = func(nest, *args, **kwargs)
+
+            frame = sys._getframe(1)
+            while frame.f_code.co_filename in [NEST_FILE, __file__]:
+                frame = frame.f_back
+            code = frame.f_code
+            site = f'{os.path.basename(code.co_filename)}:{frame.f_lineno} ' \
+                                                        f'({code.co_name})'
+
+            rec = stats[(site, op)]
+            rec['calls'] += 1
+            rec['in'] += len(nest)
+            rec['out'] += len(out) if hasattr(out, '__len__') else 0
+            return out
+        return functools.wraps(func)(inner)
+
+    def report(self):
+        """
+        Return the call sites ranked by total elements touched (in + out).
+        """
+        out = [{'site': site, 'op': op, **rec, 'touched': rec['in'] + rec['out']}
+                                    for (site, op), rec in self.stats.items()]
+        return sorted(out, key=lambda x: x['touched'], reverse=True)
+
+    def format_report(self, top=20):
+        lines = [f'{"touched":>10}{"calls":>8}{"in":>10}{"out":>10}  op @ site']
+        for rec in self.report()[:top]:
+            lines.append(f'{rec["touched"]:>10}{rec["calls"]:>8}{rec["in"]:>10}'
+                         f'{rec["out"]:>10}  {rec["op"]} @ {rec["site"]}')
+        return '\n'.join(lines)
+
+NEST_FILE = sys.modules[Nest.__module__].__file__
@@ -0,0 +1,260 @@
+from collections import defaultdict
+from .words import Words
+import bisect
+
+class Lattice:
+
+    """
+    Ruled-line (lattice) view of a page - tables are read straight from the
+    cells enclosed by snapped/joined edges rather than by clustering text.
+    """
+
+    def __init__(self, page, settings):
+        """
+        Build edges, intersections and cells then group cells into tables.
+        """
+        self.page = page
+        self.settings = settings
+
+        self.h_edges, self.v_edges = self.get_edges()
+        self.points = self.find_intersections()
+        self.cells = self.find_cells()
+        grids = [LatticeGrid(x, page.words) for x in self.group_cells()]
+        # A label column plus at least one data column - horizontal rules
+        # alone (closed at their ends) only enclose a single column
+        self.tables = [x for x in grids if len(x.xs) > 2]
+        self.tables.sort(key=lambda x: x.y1, reverse=True)  # Top down
+
+    def get_edges(self):
+        """
+        Return snapped/joined (pos, start, end) edges in each orientation.
+        """
+        snap_tol = self.settings['snap_tolerance']
+        join_tol = self.settings['join_tolerance']
+        min_len = self.settings['edge_min_length']
+
+        h_edges, v_edges = [], []
+        for ln in self.page.lines:
+            if abs(ln.y1 - ln.y0) <= snap_tol and ln.x1 - ln.x0 >= min_len:
+                h_edges.append((ln.midy, ln.x0, ln.x1))
+            elif abs(ln.x1 - ln.x0) <= snap_tol and ln.y1 - ln.y0 >= min_len:
+                v_edges.append((ln.midx, ln.y0, ln.y1))
+
+        # Explicit lines are given in page coordinates - the page's lines
+        # have been moved into document y
+        off = self.page.y_offset
+        for x in self.settings['explicit_vertical_lines']:
+            v_edges.append((x, off, self.page.h + off))
+        for y in self.settings['explicit_horizontal_lines']:
+            h_edges.append((y + off, 0, self.page.w))
+
+        h_edges = join_edges(snap_edges(h_edges, snap_tol), join_tol)
+
+        # Close tables without outer vertical rules at the horizontal line ends
+        v_xs = sorted([x[0] for x in v_edges])
+        for end in get_end_edges(h_edges, snap_tol):
+            i = bisect.bisect_left(v_xs, end[0] - snap_tol)
+            if i == len(v_xs) or v_xs[i] > end[0] + snap_tol:
+                v_edges.append(end)
+
+        v_edges = join_edges(snap_edges(v_edges, snap_tol), join_tol)
+
+        return [x for x in h_edges if x[2] - x[1] >= min_len], \
+                                [x for x in v_edges if x[2] - x[1] >= min_len]
+
+    def find_intersections(self):
+        """
+        Sweep horizontal edges over the x-sorted vertical edges.
+        :return: mapping of (x, y) --> (set of h edge ids, set of v edge ids).
+        """
+        x_tol = self.settings['intersection_x_tolerance']
+        y_tol = self.settings['intersection_y_tolerance']
+
+        v_edges = sorted(enumerate(self.v_edges), key=lambda x: x[1][0])
+        v_xs = [x[0] for _, x in v_edges]
+
+        points = defaultdict(lambda: (set(), set()))
+        for h_i, (y, x0, x1) in enumerate(self.h_edges):
+            lo = bisect.bisect_left(v_xs, x0 - x_tol)
+            hi = bisect.bisect_right(v_xs, x1 + x_tol)
+            for v_i, (x, y0, y1) in v_edges[lo:hi]:
+                if y0 - y_tol <= y <= y1 + y_tol:
+                    points[(x, y)][0].add(h_i)
+                    points[(x, y)][1].add(v_i)
+
+        return points
+
+    def find_cells(self):
+        """
+        Find the smallest rectangles whose corners are joined up by edges.
+        """
+        rows, cols = defaultdict(list), defaultdict(list)
+        for x, y in self.points:
+            rows[y].append(x)
+            cols[x].append(y)
+        for ls in [*rows.values(), *cols.values()]:
+            ls.sort()
+
+        def joined(p, q, axis):
+            return bool(self.points[p][axis] & self.points[q][axis])
+
+        cells = []
+        for (x, y) in self.points:
+            # Look right along the row and down the column from top-left corner
+            rights = [r for r in rows[y] if r > x]
+            downs = [d for d in cols[x] if d < y][::-1]
+            for r in rights:
+                if not joined((x, y), (r, y), 0):
+                    break
+                found = False
+                for d in downs:
+                    if not joined((x, y), (x, d), 1):
+                        break
+                    if (r, d) not in self.points:
+                        continue
+                    if joined((r, y), (r, d), 1) and joined((x, d), (r, d), 0):
+                        cells.append((x, d, r, y))  # x0, y0, x1, y1
+                        found = True
+                        break
+                if found:
+                    break
+
+        return cells
+
+    def group_cells(self):
+        """
+        Group the cells which share corners into separate tables.
+        """
+        parent = list(range(len(self.cells)))
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        corners = {}
+        for i, (x0, y0, x1, y1) in enumerate(self.cells):
+            for corner in [(x0, y0), (x0, y1), (x1, y0), (x1, y1)]:
+                if corner in corners:
+                    parent[find(i)] = find(corners[corner])
+                else:
+                    corners[corner] = i
+
+        groups = defaultdict(list)
+        for i, cell in enumerate(self.cells):
+            groups[find(i)].append(cell)
+
+        return [x for x in groups.values() if len(x) > 1]
+
+class LatticeGrid:
+
+    """
+    Cells of one ruled table with words assigned by sorted-breakpoint lookup.
+    """
+
+    def __init__(self, cells, words):
+        self.x0 = min([x[0] for x in cells])
+        self.y0 = min([x[1] for x in cells])
+        self.x1 = max([x[2] for x in cells])
+        self.y1 = max([x[3] for x in cells])
+
+        self.xs = sorted(set([x[0] for x in cells] + [x[2] for x in cells]))
+        self.ys = sorted(set([x[1] for x in cells] + [x[3] for x in cells]),
+                                                                reverse=True)
+
+        # Map every row/col slot onto the (possibly spanning) cell covering it
+        self.slots = {}
+        for cell in cells:
+            for i in range(self.row_idx(cell[3]), self.row_idx(cell[1])):
+                for j in range(self.col_idx(cell[0]), self.col_idx(cell[2])):
+                    self.slots[(i, j)] = cell
+
+        self.words = {x: Words() for x in cells}
+        for word in words:
+            cell = self.lookup(word.midx, word.midy)
+            if cell is not None:
+                self.words[cell].append(word)
+        for cell_words in self.words.values():
+            cell_words.set_bbox()
+
+    def col_idx(self, x):
+        return bisect.bisect_left(self.xs, x)
+
+    def row_idx(self, y):
+        return len(self.ys) - bisect.bisect_right(self.ys[::-1], y)
+
+    def lookup(self, x, y):
+        """
+        Return the cell containing the point (if any).
+        """
+        j = bisect.bisect_right(self.xs, x) - 1
+        i = len(self.ys) - bisect.bisect_left(self.ys[::-1], y) - 1
+        return self.slots.get((i, j))
+
+    @property
+    def matrix(self):
+        """
+        Dense rows (top to bottom) x cols of cell Words.
+        """
+        n_rows, n_cols = len(self.ys) - 1, len(self.xs) - 1
+        return [[self.words[self.slots[(i, j)]] if (i, j) in self.slots
+                    else Words() for j in range(n_cols)] for i in range(n_rows)]
+
+def snap_edges(edges, tol):
+    """
+    Snap edges whose positions are within tolerance to their mean position.
+    """
+    edges = sorted(edges)
+    out, group = [], []
+    for edge in edges:
+        if group and edge[0] - group[-1][0] > tol:
+            out.extend(snap_group(group))
+            group = []
+        group.append(edge)
+    out.extend(snap_group(group))
+    return out
+
+def snap_group(group):
+    if not group:
+        return []
+    pos = sum([x[0] for x in group]) / len(group)
+    return [(pos, x[1], x[2]) for x in group]
+
+def join_edges(edges, tol):
+    """
+    Join collinear edges which overlap or are separated by a small gap.
+    """
+    out = []
+    for pos, start, end in sorted(edges):
+        if out and out[-1][0] == pos and start <= out[-1][2] + tol:
+            out[-1] = (pos, out[-1][1], max(end, out[-1][2]))
+        else:
+            out.append((pos, start, end))
+    return out
+
+def get_end_edges(h_edges, tol):
+    """
+    Return vertical edges joining up the aligned ends of horizontal edges -
+    broken wherever the spacing jumps (i.e. between separate tables).
+    """
+    out = []
+    for i in [1, 2]:  # Start then end x
+        ends = snap_edges([(x[i], x[0], x[0]) for x in h_edges], tol)
+        groups = defaultdict(list)
+        for x, y, _ in ends:
+            groups[x].append(y)
+        for x, ys in groups.items():
+            ys.sort()
+            gaps = [y - ys[j] for j, y in enumerate(ys[1:])]
+            if not gaps:
+                continue
+            max_gap = 2 * sorted(gaps)[len(gaps) // 2]
+            start = ys[0]
+            for j, gap in enumerate(gaps):
+                if gap > max_gap:
+                    if ys[j] > start:
+                        out.append((x, start, ys[j]))
+                    start = ys[j+1]
+            if ys[-1] > start:
+                out.append((x, start, ys[-1]))
+    return out
@@ -1,6 +1,5 @@
 import itertools
 import re
-import numpy as np
 from . import helper
 from collections.abc import MutableSequence
 
@@ -156,8 +155,9 @@ class Nest(MutableSequence, BasePDF):
         """
         ref_ls = [getattr(x, attr) for x in self if hasattr(x, attr)]
         if not ref_ls:
-            return None        
-        return eval(f'np.{qnt}')(ref_ls)
+            return None
+        import numpy as np  # Only on first use - keeps `import pdfgravy` cheap
+        return getattr(np, qnt)(ref_ls)
 
     def set_bbox(self, x_only=False, y_only=False):
         """
@@ -181,12 +181,15 @@ class Nest(MutableSequence, BasePDF):
 
         return [x for x in self if abs(v - getattr(x, attr, '')) == min_dist][0]
     
-    def basic_sort(self, ytol: int=0, xtol: int=0) -> None:
+    def basic_sort(self, ytol: int=0, xtol: int=0, check=None) -> None:
         """
         Do a basic in place sort with the tolerances given.
+        :param check: called before every pass e.g. to raise once out of time.
         """
         i = 0
         for i in range(len(self)):
+            if check:
+                check()
             already_sorted = True
             for j in range(len(self) - i - 1):
                 word = self[j]
@@ -445,27 +448,45 @@ class Nest(MutableSequence, BasePDF):
         """
         Apply multiple clustering strategies to accommodate alignments.
         """
-        if orientation == 'horizontal':
-            vars = ['x.x0', 'x.x1', 'x.midx']
-        else:
-            vars = ['x.y0', 'x.y1', 'x.midy']
-
         out = type(self)()
         max_len = 0
-        for var in vars:
-            clusters = self.cluster(lambda x: eval(var), tol)
-            
+        for var, clusters in self.align_clusters(orientation, tol).items():
             # Check to see if any match the highest count
             for cluster in clusters:
                 if len(cluster) <= max_len:
                     continue
                 max_len = len(cluster)
-                align = var[2:]
+                align = var
 
-            out.addtwigs(clusters)
+            out.addtwigs(type(self)(*[type(self)(*[self[i] for i in x])
+                                                        for x in clusters]))
 
         return out, align
 
+    def align_clusters(self, orientation, tol):
+        """
+        Gap-cluster the elements by all three alignments (l/r/mid or b/t/mid)
+        at once.
+        :return: mapping of alignment --> list of element index arrays.
+        """
+        if orientation == 'horizontal':
+            vars, lo, hi = ['x0', 'x1', 'midx'], 'x0', 'x1'
+        else:
+            vars, lo, hi = ['y0', 'y1', 'midy'], 'y0', 'y1'
+
+        import numpy as np
+        pts = np.array([[getattr(x, lo), getattr(x, hi)] for x in self],
+                                                    dtype=float).reshape(-1, 2)
+        vals = np.vstack([pts[:, 0], pts[:, 1], pts.mean(axis=1)])
+
+        order = np.argsort(vals, axis=1, kind='stable')
+        gaps = np.diff(np.take_along_axis(vals, order, axis=1), axis=1) > tol
+
+        out = {}
+        for i, var in enumerate(vars):
+            out[var] = np.split(order[i], np.flatnonzero(gaps[i]) + 1)
+        return out
+
     def apply_nested(self, fn, *args, **kwargs):
         """
         Apply some function to all the nested elements in the nest.
@@ -0,0 +1,125 @@
+"""
+Document outline (bookmarks) and page tree lookups which never interpret any
+page content.
+"""
+from pdfminer.pdftypes import PDFObjRef, resolve1, dict_value, list_value
+from pdfminer.psparser import PSLiteral
+
+# Index of the top coordinate in each destination type (if it has one)
+TOP_IDX = {'XYZ': 3, 'FitH': 2, 'FitBH': 2, 'FitR': 5}
+
+class Outline:
+
+    """
+    The bookmarks as (title, destination) pairs. Destinations are resolved on
+    first access - only while the document is open (see detach).
+    """
+
+    def __init__(self, doc):
+        self.doc = doc
+        try:
+            self.entries = [x[:4] for x in doc.get_outlines()]
+        except Exception:
+            self.entries = []  # No (or a broken) outline
+        self._dests = {}
+        self._pages = None  # Page objid --> page_no
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getitem__(self, i):
+        return self.entries[i][1], self.dest(i)
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def level(self, i):
+        return self.entries[i][0]
+
+    def dest(self, i):
+        """
+        Return the resolved destination of the ith bookmark (None if unknown).
+        """
+        if i not in self._dests and self.doc is not None:
+            try:
+                self._dests[i] = self.resolve_dest(*self.entries[i][2:4])
+            except Exception:
+                self._dests[i] = None
+        return self._dests.get(i)
+
+    def resolve_dest(self, dest, action):
+        if dest is None and action is not None:
+            dest = dict_value(action).get('D')  # GoTo action
+        dest = resolve1(dest)
+        if isinstance(dest, PSLiteral):
+            dest = dest.name
+        if isinstance(dest, (str, bytes)):
+            dest = self.doc.get_dest(dest)  # Named - looked up individually
+        return resolve1(dest)
+
+    def locate(self, i):
+        """
+        Return the (page_no, top y) targeted by the ith bookmark - y is None
+        for destinations which only name the page.
+        """
+        dest = self.dest(i)
+        if isinstance(dest, dict):
+            dest = resolve1(dest.get('D'))
+        if not isinstance(dest, list) or not dest:
+            return None
+
+        if isinstance(dest[0], PDFObjRef):
+            if self._pages is None:
+                if self.doc is None:
+                    return None
+                self._pages = {x: k+1 for k, x in enumerate(page_ids(self.doc))}
+            page_no = self._pages.get(dest[0].objid)
+        else:
+            page_no = dest[0] + 1 if isinstance(dest[0], int) else None
+        if page_no is None:
+            return None
+
+        kind = dest[1].name if len(dest) > 1 and \
+                                isinstance(dest[1], PSLiteral) else None
+        top = resolve1(dest[TOP_IDX[kind]]) if kind in TOP_IDX and \
+                                            len(dest) > TOP_IDX[kind] else None
+        return page_no, top if isinstance(top, (int, float)) else None
+
+    def resolve(self):
+        """
+        Resolve every destination (and the page map) then detach.
+        """
+        for i in range(len(self)):
+            self.dest(i)
+        if self.entries and self._pages is None:
+            self._pages = {x: k+1 for k, x in enumerate(page_ids(self.doc))}
+        self.detach()
+
+    def detach(self):
+        """
+        Drop the document (e.g. before its stream closes) - unresolved
+        destinations are None from then on.
+        """
+        self.doc = None
+
+def page_ids(doc):
+    """
+    Return the objids of the pages in order by walking the page tree.
+    """
+    out = []
+    stack = [doc.catalog['Pages']]
+    while stack:
+        ref = stack.pop()
+        node = dict_value(ref)
+        if 'Kids' in node:
+            stack.extend(reversed(list_value(node['Kids'])))
+        else:
+            out.append(ref.objid if isinstance(ref, PDFObjRef) else None)
+    return out
+
+def count_pages(doc):
+    """
+    Page count from the root of the page tree (walking it if missing).
+    """
+    count = resolve1(dict_value(doc.catalog['Pages']).get('Count'))
+    return count if isinstance(count, int) else len(page_ids(doc))
@@ -1,7 +1,13 @@
 from .nest import Nest, Nested
-from .table import Table
 from .words import Word, Words, Header
-import numpy as np
+from .instrument import NULL, timed
+from .budget import Budget, BudgetExceeded
+from .device import dedupe_overprints
+
+# Attributes kept when pages are shipped to worker processes
+CHAR_ATTRS = ['_text', '_font', '_caps', 'fontname', 'size', 'upright', 'adv',
+                    'width', 'height', 'x0', 'x1', 'y0', 'y1', 'i', 'cvttype']
+LINE_ATTRS = ['linewidth', 'stroke', 'x0', 'x1', 'y0', 'y1', 'i', 'cvttype']
 
 class Page:
 
@@ -9,61 +15,188 @@ class Page:
     Access to page-level operations all conducted through this class.
     """
 
-    def __init__(self, page_obj, page_no, device, interpreter):
+    def __init__(self, page_obj, page_no, device, interpreter, settings={},
+                                                profiler=NULL, budget=None):
         """
         Store important info from the pdfminer page object.
+        :param settings: the parent Pdf settings - 'extract' limits the
+        components which are built.
+        :param profiler: records stage timings (see instrument.Profiler).
+        :param budget: time/object limits for the page (see budget.Budget) -
+        any breach is recorded in self.budget.
         """
         self.page_no  = page_no
         self.rotation = page_obj.attrs.get("Rotate", 0) % 360
+        self.profiler = profiler
+        self.budget = None  # Record of the limit hit (if any)
+        self.y_offset = 0  # Set once the elements are moved into doc y
 
         self.w, self.h = page_obj.mediabox[2:]
 
+        # Kept for the checks inside the long (quadratic) passes
+        budget = self.limits = budget if budget is not None else Budget()
+
         # Use pdfminer API to load precise layout of elements on page
-        interpreter.process_page(page_obj)
-        layout = device.get_result()
-
-        objects = Nest(*layout._objs, cast=True).denest('_objs', cast=True)
-        self.objects = objects.filter(lambda x:x.cvttype in [
-                                                'LTLine',
-                                                'LTRect',
-                                                'LTTextBoxHorizontal',
-                                                'LTTextLineHorizontal',
-                                                'LTChar',
-                                                'LTCurve'
-                                                ])
-        self.chars = self.get_chars()
-        self.text  = self.get_text()
-        self.curves = self.get_curves()
-        self.words = self.get_words()
-        self.lines = self.get_lines()
-        self.boxes = self.get_boxes()
+        with profiler.span('interpret', page_no):
+            try:
+                interpreter.process_page(page_obj)
+                layout = device.get_result()
+            except BudgetExceeded as e:
+                self.budget = budget.record(page_no, e)
+                layout = device.abort_page(page_obj,
+                                        self.budget['action'] == 'truncate')
+
+        with profiler.span('ingest', page_no) as span:
+            # Overprinted glyphs go before they multiply every later pass
+            tol = settings.get('overprint_tol')
+            self.overprints = dedupe_overprints(layout, tol) if tol else 0
+            span['overprints'] = self.overprints
+
+            skip = self.budget and self.budget['action'] == 'skip'
+            objects = Nest(*[] if skip else layout._objs, cast=True) \
+                                                .denest('_objs', cast=True)
+            self.objects = objects.filter(lambda x:x.cvttype in [
+                                                    'LTLine',
+                                                    'LTRect',
+                                                    'LTTextBoxHorizontal',
+                                                    'LTTextLineHorizontal',
+                                                    'LTChar',
+                                                    'LTCurve'
+                                                    ])
+            span['objects'] = len(self.objects)
+
+        extract = settings.get('extract')
+        keep_words = extract is None or 'words' in extract
+        keep_lines = extract is None or 'lines' in extract
+        keeps = lambda stage: self.in_budget(budget, stage)
+
+        self.chars = self.get_chars() if keeps('get_chars') else Nest()
+        self.text  = self.get_text() if keep_words and keeps('get_text') \
+                                                                else Nest()
+        self.curves = self.get_curves() if keep_words and keeps('get_curves') \
+                                                                else Nest()
+        self.words = Words()
+        if keep_words and keeps('get_words'):
+            try:
+                self.words = self.get_words(self.get_check('get_words'))
+            except BudgetExceeded as e:  # Out of time part way through
+                self.budget = budget.record(page_no, e)
+        with profiler.span('get_lines', page_no) as span:
+            self.lines = self.get_lines() if keep_lines and keeps('get_lines') \
+                                                                else Nest()
+            span['lines'] = len(self.lines)
+        self.boxes = self.get_boxes() if extract is None and keeps('get_boxes') \
+                                                                else Nest()
 
+    def in_budget(self, budget, stage):
+        """
+        Return True if the stage should run - checking the clock first unless
+        a limit has already been hit, in which case the budget action decides.
+        """
+        if self.budget is None:
+            try:
+                budget.check(stage)
+                return True
+            except BudgetExceeded as e:
+                self.budget = budget.record(self.page_no, e)
+
+        action = self.budget['action']
+        if action == 'degrade':
+            return stage == 'get_chars'
+        # Truncated pages are built as normal from what was interpreted
+        return action == 'truncate' and self.budget['stage'] == 'interpret'
+
+    def get_check(self, stage, limits=None):
+        """
+        Return the per-pass check for a long loop within the stage - raising
+        BudgetExceeded once out of time (None if there is nothing to check).
+        :param limits: the Budget to check (default the page's own).
+        """
+        limits = limits if limits is not None else self.limits
+        if self.budget is not None or not limits or not limits.timeout:
+            return None  # Unlimited or already over budget (see in_budget)
+        return lambda: limits.check(stage)
+
+    @timed('extract_tables', lambda x: {'tables': len(x)})
     def extract_tables(self, user_settings={}):
         """
-        Divide the page into tables and extract the data therein.
+        Divide the page into tables - the data therein is only extracted once
+        a table's spokes are accessed.
         """
-        self.tbls = {}
+        # Table machinery is only imported by the jobs which need it
+        from .table import Table, Tables
+        from .grid import GridEngine
+
+        self.tbls = Tables()
 
         settings = Table.Settings(user_settings)
+
+        if self.budget and self.budget['action'] != 'truncate':
+            return self.tbls  # No table analysis once over budget
+
+        if settings['strategy'] == 'lines':
+            if settings['remove_whitespace']:
+                self.words.apply_nested(lambda x: x.rm_wspace())
+            self.tbls = Tables(enumerate(Table.find_lattice(self, settings)))
+            return self.tbls
         
-        if settings['header_pattern']:            
-            self.split_by_headers(settings['header_pattern'])
+        if settings['header_pattern']:
+            # The page's time allowance again, from now, for the header split
+            limits = Budget(self.limits.timeout, action=self.limits.action)
+            try:
+                self.split_by_headers(settings['header_pattern'],
+                                    self.get_check('extract_tables', limits))
+            except BudgetExceeded as e:
+                self.budget = limits.record(self.page_no, e)
+                self.tbls = Tables()
+                return self.tbls
         if settings['remove_whitespace']:
             self.words.apply_nested(lambda x: x.rm_wspace())
 
+        # Shared by all tables so that sub-region grids are only built once
+        self.grids = GridEngine(self)
+
         for i, (header, footer, title) in enumerate(self.tbls.values()):
             self.tbls[i] = Table(self, header, footer, title, settings)
 
         return self.tbls
 
-    def split_by_headers(self, pattern):
+    def compact(self):
+        """
+        Return a copy of the page with just the words/lines (and the minimal
+        char attrs) needed for table extraction - i.e. cheap to pickle.
+        """
+        out = object.__new__(type(self))
+        out.page_no, out.rotation, out.w, out.h = \
+                                    self.page_no, self.rotation, self.w, self.h
+        out.profiler, out.budget, out.limits = NULL, self.budget, self.limits
+        out.y_offset = self.y_offset
+
+        out.words = Words()
+        for word in self.words:
+            ad_word = copy_attrs(word, [x for x in vars(word)
+                                            if x not in ['_ls', 'parent']])
+            ad_word._ls = []
+            ad_word.addtwigs(*[copy_attrs(x, CHAR_ATTRS) for x in word])
+            out.words.addtwigs(ad_word)
+        out.words.set_bbox()
+
+        out.lines = Nest(*[copy_attrs(x, LINE_ATTRS) for x in self.lines])
+        return out
+
+    def split_by_headers(self, pattern, check=None):
         """
         Use header info to isolate coordinates of tables in page.
+        :param check: called for every row e.g. to raise once out of time.
         """
-        rows = self.words.cluster(lambda x: x.y1)
+        fn = lambda x, y: abs(x.y1 - y.y1) < 1
+        rows = Words(*sorted(self.words.cluster(fn), key=lambda x: x.agg('y1')))
+        rows.reset_idx()  # Bottom up - as expected by cvt_header2tbl
 
         header_rows = {}
         for i, row in enumerate(rows):
+            if check:
+                check()
             score = row.score_incidence(pattern, True)
 
             if score > 2:  # True if header pattern reappears consecutively
@@ -176,13 +309,26 @@ class Page:
         cs = cs.get_sorted(lambda x: len(x), inv=True)
         return cs
 
-    def get_words(self):
+    @timed('get_words', lambda x: {'words': len(x),
+                                    'chars': sum([len(y) for y in x])})
+    def get_words(self, check=None):
         ws = Words(*[Word(*x._objs, cast=True) for x in self.text], cast=True)
-        ws.basic_sort(ytol=2)
+        ws.basic_sort(ytol=2, check=check)
         words = ws.clean()
         words = words.join_bullets(self.curves)
         words = words.split_fonts().filter(Word.test_alphanum)
         words = words.split_close()
         words.lbl_ends()
         words = words.apply_nested(Word.set_font)
-        return words.filter(lambda x: not x.marks_p)
\ No newline at end of file
+        return words.filter(lambda x: not x.marks_p)
+
+def copy_attrs(elem, attrs):
+    """
+    Shallow copy of the element with only the attributes specified.
+    """
+    out = object.__new__(type(elem))
+    ref = vars(elem)
+    for attr in attrs:
+        if attr in ref:
+            setattr(out, attr, ref[attr])
+    return out
\ No newline at end of file
@@ -7,10 +7,12 @@ from .words import Word, Words
 from .nest import Nest
 from . import utils
 from . import helper
+from .instrument import NULL, get_profiler, timed
+from .outline import Outline, count_pages
+from .budget import Budget
+import bisect
 import statistics as stats
 import io
-import json
-from lxml import html
 
 class Pdf:
 
@@ -18,45 +20,106 @@ class Pdf:
     Top-level class for access to whole doc attributes/methods.
     """
 
-    def __init__(self, f, user_settings={}):
+    def __init__(self, f, user_settings={}, interpreter=None):
         """
         Load file as pdf using pdfminer's suite of reading tools.
+        :param interpreter: optional (device, interpreter) pair to reuse e.g.
+        from a warm worker - a fresh one is built otherwise.
         """
         self.settings = self.Settings(user_settings)
+        self.profiler = get_profiler(self.settings['profile'])
 
-        self.pages = []
-        device, interpreter = utils.init_interpreter()            
+        with self.profiler.span('pdf') as span:
+            self.pages = [x for x in self.load_pages(f, interpreter)]
+            self.load_elems()
+            span['pages'] = len(self.pages)
+
+    def load_pages(self, f, interpreter=None):
+        """
+        Interpret and yield the (selected) pages of the pdf one at a time.
+        """
+        if interpreter is None:
+            device, interpreter = utils.init_interpreter()
+        else:
+            device, interpreter = utils.reset_interpreter(*interpreter)
+        device.configure(self.settings['extract'], self.settings['native_lines'])
         with open(f, 'rb') if isinstance(f, str) else io.BytesIO(f) as stream:  
             doc = PDFDocument(PDFParser(stream))
             for i, page in enumerate(PDFPage.create_pages(doc)):
                 if self.settings['pages'] and i+1 not in self.settings['pages']:
                     continue
-                p = Page(page, i+1, device, interpreter)  # +1 = page_no
-                self.pages.append(p)
+                clip = self.settings['clip'] if self.settings['clip'] else {}
+                device.clip = clip.get(i+1)
+                budget = Budget(self.settings['page_timeout'],
+                                self.settings['max_objects'],
+                                self.settings['budget_action'])
+                device.budget = budget if budget else None
+                yield Page(page, i+1, device, interpreter, self.settings,
+                                    self.profiler, budget)  # +1 = page_no
+            device.budget = None
 
             self.load_info(doc)
+            self.bmarks.resolve()  # Before the stream closes
+
+    @classmethod
+    def inspect(cls, f, resolve_dests=False):
+        """
+        Quick open for triage - read the page count, info, bookmarks and XMP
+        metadata from the xref/catalog/page tree without interpreting pages.
+        :param resolve_dests: resolve the bookmark destinations up front and
+        release the document - otherwise its bytes stay in memory so that
+        destinations resolve on first access (until bmarks.detach()).
+        :return: a Pdf with no pages loaded.
+        """
+        out = object.__new__(cls)
+        out.settings = cls.Settings({})
+        out.profiler = NULL
+        out.pages = []
+
+        if isinstance(f, str):
+            with open(f, 'rb') as stream:
+                f = stream.read()
+        out.load_info(PDFDocument(PDFParser(io.BytesIO(f))))
+        if resolve_dests:
+            out.bmarks.resolve()
+
+        return out
+
+    @property
+    def budget_records(self):
+        """
+        Records of the pages which hit a limit (see budget.Budget.record).
+        """
+        return [x.budget for x in self.pages if x.budget]
 
-        self.lines = self.get_lines()
-        self.words = self.get_words()
-        self.fonts = self.get_fonts()
+    @property
+    def overprints(self):
+        """
+        Number of overprinted duplicate chars removed from the loaded pages.
+        """
+        return sum([x.overprints for x in self.pages])
+
+    def load_elems(self):
+        """
+        Aggregate the elements of the loaded pages across the whole doc.
+        """
+        with self.profiler.span('aggregate_elems') as span:
+            self.lines = self.get_lines()
+            self.words = self.get_words()
+            span['words'], span['lines'] = len(self.words), len(self.lines)
+        with self.profiler.span('get_fonts') as span:
+            self.fonts = self.get_fonts() if self.words else {}
+            span['fonts'] = len(self.fonts)
 
     def load_info(self, doc):
         """
         Store bookmark and other helpful information for later use.
         """
         self.info  = doc.info
-        
-        if 'Dests' in doc.catalog:
-            ds = doc.catalog['Dests'].resolve()
-            try:
-                ds = {k: v.resolve() for k, v in ds.items()}
-                self.bmarks = []
-                for b in doc.get_outlines():
-                    self.bmarks.append((b[1], ds[str(b[2]).strip('/\'')]))
-            except:
-                self.bmarks = []
-        else:
-            self.bmarks = []
+        self.page_count = count_pages(doc)
+
+        # Destinations are looked up per bookmark rather than all named ones
+        self.bmarks = Outline(doc)
 
         if 'Metadata' in doc.catalog:
             raw = doc.catalog['Metadata'].resolve().get_data()
@@ -76,6 +139,7 @@ class Pdf:
                 ad_off = p.words.get_sorted(lambda x:x.y1, inv=True).y1 + 10
             else:
                 ad_off = 0
+            p.y_offset = off  # Page --> doc y (elements are moved in place)
             if i == 0:
                 ad_elems = [x for x in getattr(p, attr)]
             else:
@@ -138,14 +202,53 @@ class Pdf:
 
         return fonts
 
-    def get_headed_sections(self, ref_headers: list):
+    def extract_tables(self, user_settings={}, workers=None, pages=None):
+        """
+        Extract the tables from every (or the selected) page.
+        :param workers: number of processes to fan the pages out over - the
+        spokes of tables from workers are found up front (a table whose
+        spokes fail is returned unresolved with the failure in tbl.error).
+        :param pages: page numbers to extract from (default all loaded).
+        :return: mapping of page_no --> Tables in page order.
+        """
+        pages = [x for x in self.pages if pages is None or x.page_no in pages]
+        if not workers or workers < 2 or not pages:
+            return {x.page_no: x.extract_tables(user_settings) for x in pages}
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        out = {}
+        with ProcessPoolExecutor(min(workers, len(pages))) as pool:
+            jobs = [pool.submit(extract_page_tables, x.compact(), user_settings)
+                                                                for x in pages]
+            for page, job in zip(pages, jobs):
+                page.tbls = job.result()
+                for tbl in page.tbls.values():
+                    tbl.page = page  # Dropped to keep the result small
+                    if tbl.error and not hasattr(page, 'grids'):
+                        # Unresolved text tables look up grids as on the
+                        # serial path
+                        from .grid import GridEngine
+                        page.grids = GridEngine(page)
+                out[page.page_no] = page.tbls
+        return out
+
+    @timed('get_headed_sections', lambda x: {'sections': len(x)})
+    def get_headed_sections(self, ref_headers: list, outline=True):
         """
         Use the reference headers passed to split the pdf into headed sections.
         :param ref_headers: a list of reference values from which to infer
         header spacing and formatting.
+        :param outline: cut the sections at the bookmarks instead when the
+        pdf has a usable outline.
         :return: a list of PdfExtract object corresponding to the sections
         found in the pdf.
         """
+        if outline:
+            out = self.get_outline_sections()
+            if out is not None:
+                return out
+
         lns = self.lines.filter(lambda x:x.orientation == 'h')
         refs = Nest()
         words = self.words.filter(lambda x: not x.marks_p)
@@ -208,14 +311,103 @@ class Pdf:
             #extract.reset_y_coordinates()
         return [x for x in out if len(x.words) > 0]
 
+    def get_outline_sections(self, max_level=None, tol=20):
+        """
+        Split the pdf at its bookmark destinations - each is matched to the
+        nearest word at (or just below) the destination to use as the header.
+        :param max_level: ignore bookmarks nested deeper than this.
+        :param tol: max distance from the destination to a header word.
+        :return: list of PdfExtract or None if no bookmark can be located.
+        """
+        pages = {x.page_no: x for x in self.pages}
+        cuts = []
+        for i in range(len(self.bmarks)):
+            if max_level is not None and self.bmarks.level(i) > max_level:
+                continue
+            loc = self.bmarks.locate(i)
+            if loc is None or loc[0] not in pages:
+                continue
+            page = pages[loc[0]]
+            if not page.words:
+                continue
+            # Destinations without a position point at the top of the page
+            top = page.h if loc[1] is None else loc[1]
+            header = self.find_header(page, top + page.y_offset, tol)
+            y = header.y0 if header is not None else top + page.y_offset
+            cuts.append((y, header, self.bmarks[i][0]))
+
+        if not cuts:
+            return None
+        cuts.sort(key=lambda x: x[0], reverse=True)
+
+        out = []
+        if self.words.filter(lambda x: x.y0 > cuts[0][0]):
+            out.append(self.extract(self, self.words.y1 + 10, cuts[0][0],
+                                                            self.words[0]))
+        for i, (y, header, title) in enumerate(cuts):
+            # Down to the next header (or top of the next position)
+            y0 = 0
+            if i < len(cuts) - 1:
+                nxt = cuts[i+1]
+                y0 = nxt[1].y1 if nxt[1] is not None else nxt[0]
+            extract = self.extract(self, y, y0, header)
+            extract.title = title
+            out.append(extract)
+
+        return [x for x in out if len(x.words) > 0]
+
+    @helper.lazy_property
+    def y1_index(self):
+        """
+        Per page (y1s, words) sorted by y1 for nearest-word lookups.
+        """
+        self._y1_index = {}
+        for page in self.pages:
+            words = sorted(page.words, key=lambda x: x.y1)
+            self._y1_index[page.page_no] = ([x.y1 for x in words], words)
+
+    def find_header(self, page, y, tol=20):
+        """
+        Return the word of the page whose top is nearest the (doc) y.
+        """
+        ys, words = self.y1_index[page.page_no]
+
+        k = bisect.bisect_left(ys, y)
+        near = [j for j in [k-1, k] if 0 <= j < len(ys) and abs(ys[j] - y) <= tol]
+        if not near:
+            return None
+        return words[min(near, key=lambda j: abs(ys[j] - y))]
+
     class Settings(Settings):
 
         defaults = {
             "precision": 0.001,
             "pages": None,
-            "headers": None
+            "headers": None,
+            "extract": None,  # e.g. {'words'} or {'lines'} - None for all
+            "clip": None,  # {page_no: (x0, y0, x1, y1)} to interpret only area
+            "native_lines": False,  # Skip pdfminer's text box grouping
+            "profile": False,  # True (or a hook object) to record stage timings
+            "page_timeout": None,  # Seconds allowed per page (see budget)
+            "max_objects": None,  # Chars/paths/images allowed per page
+            "budget_action": "degrade",  # 'skip', 'truncate' or 'degrade'
+            "overprint_tol": None  # Points e.g. 0.5 to drop overprinted chars
         }
 
+def extract_page_tables(page, user_settings):
+    """
+    Worker job - find the tables and their spokes on a compacted page.
+    """
+    tbls = page.extract_tables(user_settings)
+    for tbl in tbls.values():
+        try:
+            tbl.spokes
+        except Exception as e:
+            # Left lazy as on the serial path - spokes raise again on access
+            tbl.error = f'{type(e).__name__}: {e}'
+        tbl.page = None
+    return tbls
+
 class PdfExtract:
 
     def __init__(self, pdf: Pdf, y1: float, y0: float, 
@@ -239,6 +431,7 @@ class PdfExtract:
             self.header = header
         else:
             self.header = Word()  # Empty placeholder header
+        self.title = self.header.text  # Bookmark title for outline sections
 
     def reset_y_coordinates(self) -> None:
         """
@@ -0,0 +1,154 @@
+"""
+Local HTTP extraction service backed by a pool of warm worker processes.
+
+Run with `python -m pdfgravy.serve` then POST raw pdf bytes to /words,
+/sections or /tables.
+"""
+from multiprocessing import Pool, TimeoutError
+from flask import Flask, request, jsonify
+from pdfminer.psparser import PSException
+from .pdf import Pdf
+from .table import Table
+from . import utils
+import threading
+import argparse
+import json
+
+def run_job(kind, data, settings, args):
+    """
+    Load the pdf in the worker and return JSON-friendly results.
+    """
+    pdf = Pdf(data, settings, interpreter=utils.worker_interpreter())
+
+    if kind == 'words':
+        return [{'page': p.page_no, 'words': dump_words(p.words, p.y_offset)}
+                                                            for p in pdf.pages]
+    if kind == 'sections':
+        return [dump_section(x) for x in pdf.get_headed_sections(args)]
+    if kind == 'tables':
+        out = []
+        for page in pdf.pages:
+            tbls = page.extract_tables(args)
+            out.append({'page': page.page_no,
+                        'tables': [dump_table(x) for x in tbls.values()]})
+        return out
+
+def dump_words(words, y_offset=0):
+    """
+    :param y_offset: taken off the (document) y to give page coordinates.
+    """
+    return [{'text': x.text, 'font': x.font, 'x0': x.x0, 'x1': x.x1,
+             'y0': x.y0 - y_offset, 'y1': x.y1 - y_offset} for x in words]
+
+def dump_section(extract):
+    return {'header': extract.header.text, 'y0': extract.y0, 'y1': extract.y1,
+                                            'words': dump_words(extract.words)}
+
+def dump_table(tbl):
+    off = tbl.page.y_offset  # Page coordinates as for the words
+    try:
+        spokes = [{'title': x.title, 'orientation': x.orientation,
+                   'val': x.val, 'x0': x.x0, 'x1': x.x1,
+                   'y0': x.y0 - off, 'y1': x.y1 - off} for x in tbl.spokes]
+    except Exception as e:
+        # Only this table is lost - the others on the page are still returned
+        tbl.error = f'{type(e).__name__}: {e}'
+        return {'title': tbl.title, 'y0': tbl.y0 - off, 'y1': tbl.y1 - off,
+                                                            'error': tbl.error}
+    return {'title': tbl.title, 'y0': tbl.y0 - off, 'y1': tbl.y1 - off,
+                                                            'spokes': spokes}
+
+class Server:
+
+    """
+    Flask front-end which hands work to pre-forked workers with back-pressure.
+    """
+
+    def __init__(self, workers=2, queue=8, timeout=300):
+        """
+        Fork the workers up front and cap the number of requests in flight.
+        :param workers: number of worker processes.
+        :param queue: number of requests allowed to wait for a free worker
+        before new ones are rejected with a 503.
+        :param timeout: seconds to wait for a worker result.
+        """
+        self.pool = Pool(workers, initializer=utils.init_worker)
+        self.slots = threading.BoundedSemaphore(workers + queue)
+        self.timeout = timeout
+
+        self.app = Flask(__name__)
+        for kind in ['words', 'sections', 'tables']:
+            self.app.add_url_rule(f'/{kind}', kind, self.handle,
+                                    methods=['POST'], defaults={'kind': kind})
+
+    def handle(self, kind):
+        """
+        Queue the posted pdf for processing unless the queue is already full.
+        """
+        if not self.slots.acquire(blocking=False):
+            resp = jsonify(error='Server busy - retry later')
+            resp.status_code = 503
+            resp.headers['Retry-After'] = '1'
+            return resp
+        release = True
+        try:
+            try:
+                settings = json.loads(request.args.get('settings', '{}'))
+                Pdf.Settings(settings)
+                if kind == 'sections':
+                    args = [x for x in request.args.get('headers', '')
+                                                .lower().split(',') if x]
+                else:
+                    args = json.loads(request.args.get('table_settings', '{}'))
+                    Table.Settings(args)
+            except ValueError as e:  # Incl. JSON errors and unknown settings
+                return jsonify(error=f'{type(e).__name__}: {e}'), 400
+
+            # The slot is held until the worker is done - even after a 504
+            job = self.pool.apply_async(run_job,
+                                (kind, request.get_data(), settings, args),
+                                callback=self.free, error_callback=self.free)
+            release = False
+            return self.respond(job.get(self.timeout))
+        except TimeoutError:
+            return jsonify(error='Timed out'), 504
+        except PSException as e:
+            # Bytes pdfminer can't parse e.g. not a pdf or truncated
+            return jsonify(error=f'{type(e).__name__}: {e}'), 400
+        except Exception as e:
+            return jsonify(error=f'{type(e).__name__}: {e}'), 500
+        finally:
+            if release:
+                self.slots.release()
+
+    def free(self, result):
+        """
+        Job callback - release the request's slot once its worker is free.
+        """
+        self.slots.release()
+
+    def respond(self, out):
+        body = json.dumps(out, default=utils.json_default)
+        return self.app.response_class(body, mimetype='application/json')
+
+    def close(self):
+        self.pool.terminate()
+        self.pool.join()
+
+def main():
+    parser = argparse.ArgumentParser(description='pdfgravy HTTP service')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--queue', type=int, default=8)
+    parser.add_argument('--timeout', type=int, default=300)
+    args = parser.parse_args()
+
+    server = Server(args.workers, args.queue, args.timeout)
+    try:
+        server.app.run(args.host, args.port, threaded=True)
+    finally:
+        server.close()
+
+if __name__ == '__main__':
+    main()
@@ -22,7 +22,7 @@ class Settings(dict):
         """
         Fill blank entries in the combined dictionary with fallbacks.
         """
-        for k in [k for k in self.fallbacks if not self.combi[k]]:
+        for k in [k for k in self.fallbacks if self.combi[k] is None]:
             new_k = self.fallbacks[k]
 
-            self.combi[k] = self.defaults[new_k] 
\ No newline at end of file
+            self.combi[k] = self.combi[new_k]  # The user's value if given 
\ No newline at end of file
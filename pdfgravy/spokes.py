@@ -64,11 +64,14 @@ class Spoke:
         
         self.debug = data
 
-        self.x0 = min([data.agg('x0', 'min'), self.lbls.agg('x0', 'min')])
-        self.x1 = max([data.agg('x1', 'max'), self.lbls.agg('x1', 'max')])
+        # Either data/labels may be empty (e.g. blank cells in ruled tables)
+        refs = [x for x in [data, self.lbls] if x.agg('x0', 'min') is not None]
 
-        self.y0 = min([data.agg('y0', 'min'), self.lbls.agg('y0', 'min')])
-        self.y1 = max([data.agg('y1', 'max'), self.lbls.agg('y1', 'max')])
+        self.x0 = min([x.agg('x0', 'min') for x in refs])
+        self.x1 = max([x.agg('x1', 'max') for x in refs])
+
+        self.y0 = min([x.agg('y0', 'min') for x in refs])
+        self.y1 = max([x.agg('y1', 'max') for x in refs])
 
     def __repr__(self):
         return f'{self.title}: {self.val} ({self.orientation})'
\ No newline at end of file
@@ -1,15 +1,19 @@
 from .words import Words
 from .nest import Nest, Nested
 from . import helper
-from .grid import Grid
+from .lattice import Lattice
 from .spokes import Spoke, Spokes
+from .cells import Cells
 from .settings import Settings
+import re
 
 class Table:
 
+    error = None  # Why the spokes failed when found in a worker
+
     def __init__(self, page, header, footer, title, settings):
         """
-        Every table is immediately plotted on creation of the instance.
+        Only the table's extent is stored - spokes are found on first access.
         """
         self.header = header
         self.footer = footer
@@ -19,16 +23,30 @@ class Table:
 
         self.y0, self.y1 = self.footer.y0, self.header.y1
 
-        self.find_spokes()
-
     def __repr__(self):
         return f'{self.title}, {self.y1}, {self.y0}'
 
+    @helper.lazy_property
+    def spokes(self):
+        self.find_spokes()
+
+    @helper.lazy_property
+    def cells(self):
+        self._cells = Cells(self.spokes, self.page.words)
+
+    def to_arrays(self):
+        """
+        Return the cell values as float64 arrays plus missing/percent masks
+        and units (see Cells.to_arrays).
+        """
+        return self.cells.to_arrays()
+
     def find_spokes(self):
         """
-        Find vertical/horizontal spokes in the table.
+        Find vertical/horizontal spokes in the table - only stored once
+        complete so that a failure isn't cached as a partial result.
         """
-        self.spokes = Spokes()
+        spokes = Spokes()
 
         # Look from right to left over known vertical (i.e. header) labels
         off_r = self.header.period
@@ -37,15 +55,17 @@ class Table:
             # Find data - adjusting for offset each iteration
             v_data, off_r = self.get_v_spoke_data(v_lbl, off_r)
 
-            self.spokes.add_vertical(v_lbl, v_data, self.page.words)
+            spokes.add_vertical(v_lbl, v_data, self.page.words)
 
-        x0, y1 = self.spokes.get_data_vertex()  # Cut to data limit
-        h_spokes = Grid(self.page, x0, None, self.y0, y1).rows
+        x0, y1 = spokes.get_data_vertex()  # Cut to data limit
+        h_spokes = self.page.grids.get(x0, None, self.y0, y1).rows
         
         h_lbls = self.get_h_lbls(x0, y1, h_spokes)
         
         for i, h_data in enumerate(h_spokes):
-            self.spokes.add_horizontal(h_data, h_lbls[i])
+            spokes.add_horizontal(h_data, h_lbls[i])
+
+        self._spokes = spokes
 
     def get_v_spoke_data(self, hd, off_r):
         """
@@ -54,7 +74,7 @@ class Table:
         mid = hd.midx
             
         # Cut from just after midpoint of label to far right possible col 
-        cols_r = Grid(self.page, mid+10, mid+off_r+10, self.y0, hd.y0).cols
+        cols_r = self.page.grids.get(mid+10, mid+off_r+10, self.y0, hd.y0).cols
         
         off_r = cols_r[-1].agg('midx', 'median') - mid if cols_r else 0
 
@@ -67,7 +87,7 @@ class Table:
             else:
                 cut_r = mid
                 
-            cols_l = Grid(self.page, mid-off_r, cut_r, self.y0, hd.y0).cols
+            cols_l = self.page.grids.get(mid-off_r, cut_r, self.y0, hd.y0).cols
 
         return Nest(*cols_r, *cols_l), off_r
 
@@ -77,7 +97,7 @@ class Table:
         """
         h_lbls = [[] for x in range(len(h_spokes))]
 
-        lbl_grid = Grid(self.page, None, cutx, self.y0, cuty+5)
+        lbl_grid = self.page.grids.get(None, cutx, self.y0, cuty+5)
         for col in lbl_grid.cols:
             
             # Split each col into *exact*/label-friendly rows
@@ -98,6 +118,13 @@ class Table:
 
         return h_lbls[::-1]
 
+    @classmethod
+    def find_lattice(cls, page, settings):
+        """
+        Return the ruled tables on the page read straight from their cells.
+        """
+        return [LatticeTable(page, x, settings) for x in Lattice(page, settings).tables]
+
     class Settings(Settings):
 
         defaults = {
@@ -116,10 +143,101 @@ class Table:
             "header_pattern": [r'(?:20|FY|fy)(\d\d)'],
             "word_tolerance_vertical": 5,
             "word_tolerance_horizontal": 5,
-            "remove_whitespace": True
+            "remove_whitespace": True,
+            "strategy": "text"  # Or 'lines' for ruled (lattice) tables
         }
 
         fallbacks = {
             "intersection_x_tolerance": "intersection_tolerance",
             "intersection_y_tolerance": "intersection_tolerance"
-        }
\ No newline at end of file
+        }
+
+class Tables(dict):
+
+    """
+    Tables found on a page keyed by index.
+    """
+
+    def select(self, pattern, flags=re.I):
+        """
+        Return the tables whose title matches the regex (keeping their keys).
+        """
+        return type(self)({k: v for k, v in self.items()
+                                        if re.search(pattern, v.title, flags)})
+
+class LatticeTable(Table):
+
+    def __init__(self, page, grid, settings):
+        """
+        Ruled tables come with their cells so only the header/title are read
+        up front - spokes are again found on first access.
+        """
+        self.grid = grid
+        self.settings = settings
+        self.page = page
+
+        self.x0, self.x1 = grid.x0, grid.x1
+        self.y0, self.y1 = grid.y0, grid.y1
+
+        matrix = grid.matrix
+        self.hd_i = self.find_header_row(matrix)
+        self.header = Words(*self.get_row_words(matrix[self.hd_i]))
+        self.footer = Words(*self.get_row_words(matrix[-1]))
+        self.title = self.find_title().strip('\n \r')
+
+    @staticmethod
+    def get_row_words(row):
+        """
+        Return the words in the row without repeats from spanning cells.
+        """
+        return [x for y in {id(x): x for x in row}.values() for x in y]
+
+    def find_header_row(self, matrix):
+        """
+        The header is the first row with any text right of the label column.
+        """
+        for i, row in enumerate(matrix):
+            if any([x.midx > self.grid.xs[1] for x in self.get_row_words(row)]):
+                return i
+        return 0
+
+    def find_title(self):
+        """
+        Take the nearest text above the header row (inside the table or not).
+        """
+        chkAbove = lambda x: 0 <= x.y0 - self.header.y1 + 2 < 50
+        chkHoriz = lambda x: x.x1 > self.x0 and x.x0 < self.x1
+        above = self.page.words.filter(lambda x: chkAbove(x) and chkHoriz(x))
+        if not above:
+            return 'n/a'
+
+        # Stitch together the nearest line (e.g. split by sub/superscripts)
+        ref = above.get_sorted(lambda x: x.y0)
+        line = above.filter(lambda x: abs(x.midy - ref.midy) < ref.h / 2)
+        line.sort(key=lambda x: x.x0)
+
+        title = line[0].text
+        for prev, word in zip(line, line[1:]):
+            title += (' ' if word.x0 - prev.x1 > 1 else '') + word.text
+        return title
+
+    def find_spokes(self):
+        """
+        Column labels are read from the header row and row labels from the
+        first column of the cell matrix.
+        """
+        spokes = Spokes()
+
+        matrix, xs, ys = self.grid.matrix, self.grid.xs, self.grid.ys
+        for j in range(1, len(xs) - 1):
+            lbls = self.header.filter(lambda x: xs[j] <= x.midx < xs[j+1])
+            data = Nest(*[x for row in matrix[self.hd_i+1:] for x in row[j]])
+            if data or lbls:
+                spokes.append(Spoke(lbls, data, 'v', (xs[j] + xs[j+1]) / 2))
+
+        for i in range(self.hd_i + 1, len(ys) - 1):
+            data = Nest(*[x for cell in matrix[i][1:] for x in cell])
+            if data or matrix[i][0]:
+                spokes.append(Spoke(matrix[i][0], data, 'h', (ys[i] + ys[i+1]) / 2))
+
+        self._spokes = spokes
\ No newline at end of file
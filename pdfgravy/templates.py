@@ -0,0 +1,275 @@
+"""
+Layout templates - reuse the resolved table geometry of previously seen
+pages (e.g. the same issuer's report next quarter) instead of clustering.
+"""
+from collections import Counter
+from .table import Table, Tables
+from .spokes import Spoke, Spokes
+from .cells import Intervals
+from .words import Words
+from .nest import Nest
+import hashlib
+import json
+
+class Fingerprint:
+
+    """
+    Page layout summary from quantised ruling lines, header-label positions
+    and the font histogram.
+    """
+
+    def __init__(self, page, settings, quantum=5):
+        """
+        :param settings: Table settings (for the header pattern/edge length).
+        :param quantum: points to round positions to before comparing.
+        """
+        q = lambda v: int(round(v / quantum))
+        off = page.y_offset  # Back to page coordinates from the doc's
+
+        min_len = settings['edge_min_length']
+        self.lines = sorted(set([(x.orientation, q(x.x0), q(x.y0 - off),
+                                    q(x.x1), q(x.y1 - off)) for x in page.lines
+                                        if max(x.w, x.h) >= min_len]))
+
+        pattern = settings['header_pattern'] or []
+        self.headers = sorted(set([(q(x.x0), q(x.y1 - off)) for x in page.words
+                                                if x.lookup(pattern)]))
+
+        fonts = Counter([str(x.font).split('+')[-1] for x in page.words])
+        total = sum(fonts.values())
+        self.fonts = {k: round(v / total, 2) for k, v in sorted(fonts.items())}
+
+        self.key = hashlib.sha1(json.dumps([self.lines, self.headers,
+                                    sorted(self.fonts)]).encode()).hexdigest()
+
+    def to_dict(self):
+        return {'lines': self.lines, 'headers': self.headers,
+                                        'fonts': self.fonts, 'key': self.key}
+
+    @classmethod
+    def from_dict(cls, data):
+        out = object.__new__(cls)
+        out.lines = [tuple(x) for x in data['lines']]
+        out.headers = [tuple(x) for x in data['headers']]
+        out.fonts, out.key = data['fonts'], data['key']
+        return out
+
+    def similarity(self, other):
+        """
+        Score from 0 (nothing shared) to 1 (identical layout).
+        """
+        def jaccard(a, b):
+            a, b = set(a), set(b)
+            return len(a & b) / len(a | b) if a | b else 1
+
+        keys = set(self.fonts) | set(other.fonts)
+        font_diff = sum([abs(self.fonts.get(k, 0) - other.fonts.get(k, 0))
+                                                            for k in keys])
+
+        return (jaccard(self.lines, other.lines) +
+                jaccard(self.headers, other.headers) + 1 - font_diff / 2) / 3
+
+class TemplateStore:
+
+    """
+    Fingerprint --> table geometry store. Matching pages have their words
+    dropped straight into the known cells, anything else (or a template
+    which no longer fits) falls back to full analysis.
+    """
+
+    def __init__(self, min_similarity=0.9, tol=2, min_coverage=0.8):
+        """
+        :param min_similarity: lowest Fingerprint.similarity to match.
+        :param tol: points of slack around the stored row/col extents.
+        :param min_coverage: share of the table's words which must land in
+        a known cell for the template to be used.
+        """
+        self.min_similarity = min_similarity
+        self.tol = tol
+        self.min_coverage = min_coverage
+        self.templates = {}  # key --> (Fingerprint, [table geometry])
+        self.hits, self.misses = 0, 0
+
+    def __len__(self):
+        return len(self.templates)
+
+    def match(self, fingerprint):
+        """
+        Return the stored template for the layout (if any).
+        """
+        if fingerprint.key in self.templates:
+            return self.templates[fingerprint.key][1]
+
+        best, out = self.min_similarity, None
+        for ref, specs in self.templates.values():
+            score = fingerprint.similarity(ref)
+            if score >= best:
+                best, out = score, specs
+        return out
+
+    def add(self, fingerprint, tbls):
+        """
+        Record the geometry of the (fully analysed) tables - unless any of
+        them has no cells to reuse.
+        """
+        try:
+            specs = [get_geometry(x) for x in tbls.values()]
+        except Exception:
+            return  # Not worth a template if the spokes can't be resolved
+        if specs and all(specs):
+            self.templates[fingerprint.key] = (fingerprint, specs)
+
+    def extract_tables(self, page, user_settings={}):
+        """
+        Template-aware equivalent of page.extract_tables.
+        """
+        settings = Table.Settings(user_settings)
+        fingerprint = Fingerprint(page, settings)
+
+        specs = self.match(fingerprint)
+        if specs:
+            tbls = [TemplateTable(page, x, settings, self.tol) for x in specs]
+            if all([x.coverage >= self.min_coverage for x in tbls]):
+                self.hits += 1
+                page.tbls = Tables(enumerate(tbls))
+                return page.tbls
+
+        self.misses += 1
+        tbls = page.extract_tables(user_settings)
+        self.add(fingerprint, tbls)
+        return tbls
+
+    def save(self, path):
+        data = [{'fingerprint': x.to_dict(), 'tables': y}
+                                        for x, y in self.templates.values()]
+        with open(path, 'w') as f:
+            json.dump(data, f)
+
+    def load(self, path):
+        with open(path) as f:
+            for item in json.load(f):
+                fingerprint = Fingerprint.from_dict(item['fingerprint'])
+                self.templates[fingerprint.key] = (fingerprint, item['tables'])
+
+def get_geometry(tbl):
+    """
+    Return the JSON-friendly geometry of the table's cells (None if empty).
+    Cols are [x0, x1, lbl x0, lbl x1] and rows [y0, y1, lbl y0, lbl y1] -
+    data extents are kept apart from label extents as labels can span rows
+    and tend to be aligned differently to the data. All y are page-relative.
+    """
+    cells = tbl.cells
+    if not cells.rows or not cells.cols:
+        return None
+    off = tbl.page.y_offset
+
+    def extent(spoke, lo, hi):
+        data = spoke.debug
+        if data.agg(lo, 'min') is None:
+            return [getattr(spoke, lo), getattr(spoke, hi)]
+        return [data.agg(lo, 'min'), data.agg(hi, 'max')]
+
+    def lbl_extent(spoke, lo, hi):
+        if spoke.lbls.agg(lo, 'min') is None:
+            return extent(spoke, lo, hi)
+        return [spoke.lbls.agg(lo, 'min'), spoke.lbls.agg(hi, 'max')]
+
+    spokes = cells.rows + cells.cols
+    return {
+        'title': tbl.title,
+        'bbox': [min([x.x0 for x in spokes]), min([x.y0 for x in spokes]) - off,
+                 max([x.x1 for x in spokes]), max([x.y1 for x in spokes]) - off],
+        'header': [tbl.header.y0 - off, tbl.header.y1 - off],
+        'cols': [extent(x, 'x0', 'x1') + lbl_extent(x, 'x0', 'x1')
+                                                    for x in cells.cols],
+        'rows': [[y - off for y in extent(x, 'y0', 'y1') +
+                                lbl_extent(x, 'y0', 'y1')] for x in cells.rows]
+    }
+
+class TemplateTable(Table):
+
+    def __init__(self, page, spec, settings, tol=2):
+        """
+        Assign the words to the stored cells (no grid clustering).
+        """
+        self.page = page
+        self.settings = settings
+        self.spec = spec
+        self.title = spec['title']
+
+        off = page.y_offset  # Stored page-relative so shift into the doc's
+        self.x0, self.y0, self.x1, self.y1 = spec['bbox']
+        self.y0, self.y1 = self.y0 + off, self.y1 + off
+        self.cols = [(x[0] - tol, x[1] + tol) for x in spec['cols']]
+        self.lbl_cols = [(x[2] - tol, x[3] + tol) for x in spec['cols']]
+        self.rows = [(x[0] + off - tol, x[1] + off + tol) for x in spec['rows']]
+        self.lbl_rows = [(x[2] + off - tol, x[3] + off + tol)
+                                                        for x in spec['rows']]
+
+        hd_y0, hd_y1 = [x + off for x in spec['header']]
+        in_x = lambda x: self.x0 - tol <= x.midx <= self.x1 + tol
+        self.header = page.words.filter(
+                        lambda x: hd_y0 - tol <= x.midy <= hd_y1 + tol and in_x(x))
+
+        self.assign(page.words.filter(
+                        lambda x: self.y0 - tol <= x.midy <= self.y1 + tol and in_x(x)))
+
+    def assign(self, words):
+        """
+        Bucket the words by row and col - scoring how many found a home.
+        """
+        col_spans, row_spans = Intervals(self.cols), Intervals(self.rows)
+        lbl_spans = Intervals(self.lbl_rows)
+        first_x = min([x[0] for x in self.cols])
+
+        self.col_words = [Words() for x in self.cols]
+        self.col_lbls = [Words() for x in self.cols]
+        self.row_lbls = [Words() for x in self.rows]
+        self.row_words = [Words() for x in self.rows]
+
+        lbl_cols = Intervals(self.lbl_cols)
+        for word in self.header:
+            j = lbl_cols.find(word.midx)
+            if j is not None:
+                self.col_lbls[j].append(word)
+
+        header = set([id(x) for x in self.header])
+        homed, total = 0, 0
+        for word in words:
+            if id(word) in header:
+                continue
+            total += 1
+            if word.midx < first_x:
+                # Labels go to every row they span (e.g. merged cells)
+                i = lbl_spans.find(word.midy)
+                if i is None:
+                    continue
+                for k, (y0, y1) in enumerate(self.lbl_rows):
+                    if self.lbl_rows[i] == (y0, y1):
+                        self.row_lbls[k].append(word)
+                homed += 1
+                continue
+            i, j = row_spans.find(word.midy), col_spans.find(word.midx)
+            if i is not None and j is not None:
+                self.col_words[j].append(word)
+                self.row_words[i].append(word)
+                homed += 1
+
+        self.coverage = homed / total if total else 0
+        self.footer = self.row_words[-1] if self.row_words[-1] else self.header
+
+    def find_spokes(self):
+        """
+        Spokes straight from the buckets (header labels by col).
+        """
+        spokes = Spokes()
+
+        for (x0, x1), lbls, data in zip(self.cols, self.col_lbls, self.col_words):
+            if data or lbls:
+                spokes.append(Spoke(lbls, Nest(*data), 'v', (x0 + x1) / 2))
+
+        for (y0, y1), lbls, data in zip(self.rows, self.row_lbls, self.row_words):
+            if data or lbls:
+                spokes.append(Spoke(lbls, Nest(*data), 'h', (y0 + y1) / 2))
+
+        self._spokes = spokes
@@ -1,16 +1,134 @@
 from pdfminer.pdfinterp import PDFResourceManager
-from pdfminer.layout import LAParams
 from pdfminer.pdfinterp import PDFPageInterpreter
-from pdfminer.converter import PDFPageAggregator
+from pdfminer.pdftypes import PDFStream, resolve1
+from collections import OrderedDict
+from .device import PageAggregator
+import hashlib
 
-def init_interpreter():
+def init_interpreter(rsrcmgr=None):
     """
     Load pdfminer6 interpreter for layout/content parsing.
     """
-    rsrcmgr  = PDFResourceManager()
-    laparams = LAParams(char_margin=2, line_margin=2, word_margin=0.2)
-    
-    device = PDFPageAggregator(rsrcmgr, laparams=laparams)
+    rsrcmgr = rsrcmgr if rsrcmgr else PDFResourceManager()
+
+    device = PageAggregator(rsrcmgr)
     interpreter = PDFPageInterpreter(rsrcmgr, device)
 
-    return device, interpreter
\ No newline at end of file
+    return device, interpreter
+
+def reset_interpreter(device, interpreter):
+    """
+    Clear document-specific state so the interpreter can be reused.
+    """
+    if isinstance(interpreter.rsrcmgr, FontCache):
+        interpreter.rsrcmgr.reset()
+    else:
+        # pdfminer caches fonts by objid - only unique within a single document
+        interpreter.rsrcmgr._cached_fonts.clear()
+
+    return device, interpreter
+
+_worker_interpreter = None  # Set in each worker process by init_worker
+
+def init_worker():
+    """
+    Pool initializer - build the interpreter (and its font cache) once per
+    worker process before any jobs arrive.
+    """
+    global _worker_interpreter
+    _worker_interpreter = InterpreterContext()
+
+def worker_interpreter():
+    """
+    Return this process's interpreter from init_worker (None if not run).
+    """
+    return _worker_interpreter
+
+def json_default(obj):
+    """
+    json.dumps default - NumPy scalars creep in via aggregate values.
+    """
+    return obj.item()
+
+class InterpreterContext:
+
+    """
+    Long-lived interpreter for worker processes/batch jobs which keeps decoded
+    fonts between documents. Unpacks like the init_interpreter() pair.
+    """
+
+    def __init__(self, font_cache_size=256):
+        self.rsrcmgr = FontCache(font_cache_size)
+        self.device, self.interpreter = init_interpreter(self.rsrcmgr)
+
+    def __iter__(self):
+        yield self.device
+        yield self.interpreter
+
+class FontCache(PDFResourceManager):
+
+    """
+    Resource manager with a bounded LRU cache of fonts keyed by their content
+    rather than objid so that identical fonts are shared across documents.
+    """
+
+    def __init__(self, maxsize=256):
+        super().__init__(caching=True)
+        self.maxsize = maxsize
+        self._cached_fonts = OrderedDict()
+        self._doc_keys = {}  # objid --> content key for the current doc only
+        self.hits, self.misses = 0, 0
+
+    def reset(self):
+        """
+        Forget the objid lookups when moving on to a new document.
+        """
+        self._doc_keys = {}
+
+    def get_font(self, objid, spec):
+        """
+        Return the cached font for the spec - decoding it only on a miss.
+        """
+        if objid and objid in self._doc_keys:
+            key = self._doc_keys[objid]
+        else:
+            key = hash_spec(spec)
+            if objid:
+                self._doc_keys[objid] = key
+
+        if key in self._cached_fonts:
+            self.hits += 1
+            self._cached_fonts.move_to_end(key)
+            return self._cached_fonts[key]
+
+        self.misses += 1
+        font = super().get_font(None, spec)  # None skips objid caching
+        self._cached_fonts[key] = font
+        if len(self._cached_fonts) > self.maxsize:
+            self._cached_fonts.popitem(last=False)
+        return font
+
+def hash_spec(spec):
+    """
+    Digest a (font) spec including the raw bytes of any embedded streams.
+    """
+    def update(obj, depth):
+        obj = resolve1(obj)
+        if depth > 8:
+            h.update(b'...')  # Guard against reference cycles
+        elif isinstance(obj, PDFStream):
+            update(obj.attrs, depth + 1)
+            h.update(obj.get_rawdata() or obj.get_data())
+        elif isinstance(obj, dict):
+            for k in sorted(obj, key=str):
+                h.update(str(k).encode())
+                update(obj[k], depth + 1)
+        elif isinstance(obj, (list, tuple)):
+            for v in obj:
+                update(v, depth + 1)
+        else:
+            h.update(repr(obj).encode())
+
+    h = hashlib.sha1()
+    update(spec, 0)
+    return h.hexdigest()
@@ -1,10 +1,10 @@
 from itertools import permutations
+import inspect
 from pdfminer.layout import LTAnno
 from .nest import Nest, Nested
 import re
 import statistics as stats
 from . import helper
-import numpy as np
 
 class Word(Nest, Nested):
 
@@ -530,10 +530,30 @@ class Header(Words):
         self.lbls.sort(key=lambda x:x.x0)
         self.lbls.reset_idx()
 
+    def __getstate__(self):
+        """
+        Drop the row's bound methods (copied above) which can't be pickled -
+        they are rebound to an equivalent row on load.
+        """
+        state = {k: v for k, v in vars(self).items()
+                    if not callable(v) and not k.startswith('_abc_')}
+        state['_row_methods'] = [k for k, v in vars(self).items()
+                                                    if inspect.ismethod(v)]
+        return state
+
+    def __setstate__(self, state):
+        methods = state.pop('_row_methods')
+        vars(self).update(state)
+        row = Words()
+        vars(row).update(state)
+        for name in methods:
+            setattr(self, name, getattr(row, name))
+
     def cvt_header2tbl(self, prev_header, rows):
         """
         Complete info from surroundings and return table.
         """
+        lo, title = self, 'n/a'  # Defaults for headers at the page edges
         for lo in rows[prev_header.i+1:self.i]:
             if lo.shares_header(self):
                 break  # Work way up from prev to find table end
@@ -6,7 +6,10 @@ setup(
     description='A Dash of Gravy to Lighten the PDF Hellscape',
     url='https://github.com/gravy-jones-locker/imgravy',
     author='Gravy Jones',
-    packages=find_packages(),
+    packages=find_packages(exclude=['benchmarks']),
+    entry_points={
+        'console_scripts': ['pdfgravy=pdfgravy.cli:main']
+    },
     install_requires=[
         #'opencv-python',  Hashed out for development in Anaconda
         #'numpy'
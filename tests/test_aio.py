@@ -0,0 +1,48 @@
+import unittest
+import asyncio
+from pdfgravy import aio
+
+class AioTest(unittest.TestCase):
+
+    def test_aiter_pages(self):
+        async def run():
+            pdf = await aio.open_pdf('tests/pdfs/msft.pdf', workers=2)
+            return [x async for x in pdf.aiter_pages()]
+        pages = asyncio.run(run())
+        assert [x.page_no for x in pages] == [1]
+        assert len(pages[0].words) == 120
+
+    def test_concurrent_load(self):
+        async def run():
+            runner = aio.Runner(2)
+            pdfs = [await aio.open_pdf(f'tests/pdfs/{x}.pdf', runner=runner)
+                                                    for x in ['msft', 'FB_2']]
+            return await asyncio.gather(*[x.load() for x in pdfs])
+        msft, fb = asyncio.run(run())
+        assert len(msft.words) == 120
+        assert len(fb.words) == 239
+
+    def test_cancel(self):
+        async def run():
+            pdf = await aio.open_pdf('tests/pdfs/apple_65.pdf')
+            task = asyncio.ensure_future(pdf.load())
+            await asyncio.sleep(0)
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                return True
+        assert asyncio.run(run())
+
+    def test_runners(self):
+        async def run():
+            shared = await aio.open_pdf('tests/pdfs/msft.pdf')
+            own = await aio.open_pdf('tests/pdfs/msft.pdf', workers=2)
+            await asyncio.gather(shared.load(), own.load())
+            return shared, own
+        shared, own = asyncio.run(run())
+        assert shared.runner is aio.get_runner() and not shared.own_runner
+        assert own.runner is not aio.get_runner() and own.own_runner
+        assert own.runner.executor._shutdown
+        assert not shared.runner.executor._shutdown
+        assert len(own.words) == len(shared.words) == 120
@@ -0,0 +1,50 @@
+import unittest
+from benchmarks import run, startup
+
+PATH = 'tests/pdfs/msft.pdf'
+
+class BenchmarkTest(unittest.TestCase):
+
+    def test_stages(self):
+        with open(PATH, 'rb') as f:
+            out = run.run(f.read(), repeat=1,
+                                    table_settings={'strategy': 'lines'})
+
+        assert list(out) == run.STAGES
+        assert all([x['wall'] > 0 and x['peak'] > 0 for x in out.values()])
+
+    def test_stage_settings(self):
+        with open(PATH, 'rb') as f:
+            data = f.read()
+        for extract in [None, {'lines'}]:
+            state = {}
+            for name, fn in run.get_stages(data, {'extract': extract},
+                                                            state=state)[:4]:
+                fn()
+            page, = state['pages']
+            assert bool(page.chars) == (extract is None)  # Device configured
+            assert bool(page.words) == (extract is None)
+            assert page.lines
+
+    def test_compare(self):
+        baseline = {'a.pdf': {'ingest': {'wall': 1.0, 'peak': 100}}}
+        results = {'a.pdf': {'ingest': {'wall': 1.1, 'peak': 200}}}
+
+        assert run.compare(results, baseline, 0.2) == [
+            ('a.pdf', 'ingest', 'peak', 100, 200)]
+
+class StartupTest(unittest.TestCase):
+
+    def test_lazy_imports(self):
+        out = startup.run({x: startup.SCENARIOS[x] for x in ['import', 'api']},
+                                                                    repeat=1)
+
+        assert out['import']['heavy'] == []
+        assert 'pdfminer' in out['api']['heavy']
+        assert not set(out['api']['heavy']) & {'numpy', 'lxml',
+                                    'pdfgravy.table', 'concurrent.futures'}
+
+    def test_star_import(self):
+        scope = {}
+        exec('from pdfgravy import *', scope)
+        assert 'open' not in scope and 'Pdf' in scope
@@ -0,0 +1,56 @@
+import unittest
+import weakref
+import gc
+from pdfgravy.cache import ResultCache
+
+PATH = 'tests/pdfs/msft.pdf'
+
+class CacheTest(unittest.TestCase):
+
+    def test_repeat_pdf(self):
+        cache = ResultCache()
+        pdf = cache.get_pdf(PATH)
+
+        assert cache.get_pdf(PATH) is pdf
+        assert cache.get_pdf(PATH, {'headers': ['energy']}) is not pdf
+        assert cache.stats()['hits'] == 1
+
+    def test_table_settings(self):
+        cache = ResultCache()
+        pdf = cache.get_pdf(PATH)
+        page = pdf.pages[0]
+
+        tbls = cache.extract_tables(pdf, page, {'strategy': 'lines'})
+        assert len(tbls) == 2
+        assert cache.extract_tables(pdf, page, {'strategy': 'lines'}) is tbls
+
+        cache.extract_tables(pdf, page, {'strategy': 'lines', 'snap_tolerance': 1})
+        assert cache.get_pdf(PATH) is pdf  # Page parse survives
+        assert cache.stats()['misses'] == 3
+
+    def test_detached_tables(self):
+        cache = ResultCache()
+        pdf = cache.get_pdf(PATH)
+        ref = weakref.ref(pdf.pages[0])
+        before = cache.size
+
+        tbls = cache.extract_tables(pdf, pdf.pages[0])
+        assert [x.error for x in tbls.values()] == [
+                                None, 'IndexError: list index out of range']
+        assert tbls[0].page is not pdf.pages[0]
+        assert cache.size - before > 100 * 2**10  # Sized once resolved
+
+        cache.clear()
+        del pdf
+        gc.collect()
+        assert ref() is None  # Nothing of the pdf kept by the tables
+        assert tbls[0].to_arrays()['values'].shape == tbls[0].cells.shape
+
+    def test_eviction(self):
+        cache = ResultCache(max_bytes=20 * 2**20)
+        cache.get_pdf(PATH)
+        cache.get_pdf('tests/pdfs/apple_65.pdf')
+        cache.get_pdf('tests/pdfs/FB_2.pdf')
+
+        assert cache.size <= cache.max_bytes
+        assert len(cache) < 3
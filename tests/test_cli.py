@@ -0,0 +1,98 @@
+import unittest
+import tempfile
+import json
+import csv
+import io
+import os
+from contextlib import redirect_stdout, redirect_stderr
+from pdfgravy import cli
+from benchmarks.synthetic import make_pdf
+
+PATH = 'tests/pdfs/msft.pdf'
+
+class CliTest(unittest.TestCase):
+
+    def run_cli(self, *argv):
+        out, err = io.StringIO(), io.StringIO()
+        with redirect_stdout(out), redirect_stderr(err):
+            code = cli.main(list(argv))
+        return code, out.getvalue(), err.getvalue()
+
+    def test_find_pdfs(self):
+        found = cli.find_pdfs(['tests/pdfs', PATH, 'tests/pdfs/m*.pdf'])
+        assert PATH in found and len(found) == len(set(found))
+        assert all([x.endswith('.pdf') for x in found])
+
+    def test_parse_pages(self):
+        assert cli.parse_pages('1,3-5') == [1, 3, 4, 5]
+
+    def test_words(self):
+        code, out, err = self.run_cli('words', PATH)
+        rows = [json.loads(x) for x in out.splitlines()]
+
+        assert code == 0 and not err
+        assert rows[0]['text'].startswith('2019 Data Factsheet')
+        assert set(rows[0]) == set(cli.FIELDS['words'])
+
+    def test_page_y(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'two.pdf')
+            with open(path, 'wb') as f:
+                f.write(make_pdf(pages=2))
+            code, out, err = self.run_cli('words', path)
+        rows = [json.loads(x) for x in out.splitlines()]
+        pages = [[x for x in rows if x['page'] == i] for i in [1, 2]]
+
+        assert code == 0 and pages[0] and pages[1]
+        for page in pages:  # Same layout so the same page coordinates
+            assert 0 <= min([x['y0'] for x in page]) < 792
+            assert 0 < max([x['y1'] for x in page]) <= 792
+        assert pages[0][0]['y1'] == pages[1][0]['y1']
+
+    def test_same_names(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for i, folder in enumerate(['a', 'b']):
+                os.makedirs(os.path.join(tmp, 'in', folder))
+                with open(os.path.join(tmp, 'in', folder, 'q1.pdf'), 'wb') as f:
+                    f.write(make_pdf(words=10 + i))
+            out_dir = os.path.join(tmp, 'out')
+            code, out, err = self.run_cli('words', os.path.join(tmp, 'in'),
+                                                        '--output', out_dir)
+            found = sorted([os.path.relpath(os.path.join(x[0], y), out_dir)
+                                for x in os.walk(out_dir) for y in x[2]])
+
+        assert code == 0 and not out
+        assert found == [os.path.join('a', 'q1.words.jsonl'),
+                         os.path.join('b', 'q1.words.jsonl')]
+
+    def test_tables_csv(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            code, out, err = self.run_cli('tables', PATH, '--format', 'csv',
+                    '--output', tmp, '--table-settings', '{"strategy": "lines"}')
+            with open(os.path.join(tmp, 'msft.tables.csv')) as f:
+                rows = list(csv.DictReader(f))
+
+        assert code == 0 and not out
+        assert {'col_title': 'FY19', 'text': '113,412'}.items() <= rows[0].items()
+
+    def test_tables(self):
+        code, out, err = self.run_cli('tables', PATH)
+        rows = [json.loads(x) for x in out.splitlines()]
+        failed = [x for x in rows if 'error' in x]
+
+        assert code == 0 and not err
+        assert {x['table'] for x in rows} == {0, 1}
+        assert [x['table'] for x in failed] == [1]  # Spokes raise IndexError
+        assert failed[0]['error'].startswith('IndexError')
+        assert len(rows) > len(failed)
+
+    def test_errors(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            bad = os.path.join(tmp, 'bad.pdf')
+            with open(bad, 'wb') as f:
+                f.write(b'not a pdf')
+            code, out, err = self.run_cli('info', PATH, bad, '--workers', '2')
+
+        assert code == 1
+        assert json.loads(out)['file'] == PATH
+        assert '1 of 2 files failed' in err and bad in err
@@ -0,0 +1,61 @@
+import unittest
+import json
+import pdfgravy
+from pdfgravy import instrument
+
+PATH = 'tests/pdfs/msft.pdf'
+
+class ProfileTest(unittest.TestCase):
+
+    def test_summary(self):
+        pdf = pdfgravy.Pdf(PATH, {'profile': True})
+        pdf.pages[0].extract_tables({'strategy': 'lines'})
+
+        stages = pdf.profiler.summary()['stages']
+        for stage in ['interpret', 'ingest', 'get_words', 'aggregate_elems',
+                                        'get_fonts', 'pdf', 'extract_tables']:
+            assert stages[stage]['calls'] == 1
+        assert stages['get_words']['words'] == len(pdf.words)
+        assert stages['extract_tables']['tables'] == 2
+        assert set(pdf.profiler.summary()['pages'][1]) >= {'interpret', 'get_words'}
+
+        events = json.loads(json.dumps(pdf.profiler.to_trace()))['traceEvents']
+        assert all([x['ph'] == 'X' and x['dur'] >= 0 for x in events])
+
+    def test_disabled(self):
+        pdf = pdfgravy.Pdf(PATH)
+        assert pdf.profiler is instrument.NULL
+        assert pdf.pages[0].profiler is instrument.NULL
+
+    def test_hook(self):
+        names = []
+        class Hook(instrument.Profiler):
+            def span(self, name, page=None):
+                names.append(name)
+                return super().span(name, page)
+
+        hook = Hook()
+        pdf = pdfgravy.Pdf(PATH, {'profile': hook})
+        assert pdf.profiler is hook
+        assert names[-1] == 'get_fonts' and 'interpret' in names
+
+class NestTracerTest(unittest.TestCase):
+
+    def test_counts(self):
+        words = pdfgravy.Pdf(PATH).words
+        original = pdfgravy.nest.Nest.filter
+
+        with instrument.NestTracer() as tracer:
+            words.filter(lambda x: x.y0 > 400)
+            words[:10]
+            words[0]
+
+        assert pdfgravy.nest.Nest.filter is original
+        report = tracer.report()
+        filt = [x for x in report if x['op'] == 'filter']
+        assert len(filt) == 1 and filt[0]['site'].startswith('test_instrument.py')
+        assert filt[0]['in'] == len(words)
+
+        sl = [x for x in report if x['op'] == '__getitem__']
+        assert [(x['calls'], x['out']) for x in sl] == [(1, 10)]
+        assert report == sorted(report, key=lambda x: -x['touched'])
@@ -0,0 +1,227 @@
+import unittest
+import pdfgravy
+from pdfgravy.budget import Budget, BudgetExceeded
+from benchmarks.synthetic import make_pdf, write_pdf, text
+
+PATH = 'tests/pdfs/msft.pdf'
+
+class ExtractTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.full = pdfgravy.Pdf(PATH).pages[0]
+
+    def test_words_only(self):
+        page = pdfgravy.Pdf(PATH, {'extract': {'words'}}).pages[0]
+
+        assert [x.text for x in page.words] == [x.text for x in self.full.words]
+        assert not page.lines
+
+    def test_lines_only(self):
+        pdf = pdfgravy.Pdf(PATH, {'extract': {'lines'}})
+        page = pdf.pages[0]
+
+        assert len(page.lines) == len(self.full.lines)
+        assert not page.chars and not page.words
+        assert pdf.fonts == {}
+
+    def test_bad_component(self):
+        with self.assertRaises(ValueError):
+            pdfgravy.Pdf(PATH, {'extract': {'images'}})
+
+class ClipTest(unittest.TestCase):
+
+    def test_clip(self):
+        clip = (20, 100, 600, 400)
+        full = pdfgravy.Pdf('tests/pdfs/apple_65.pdf').pages[0]
+        page = pdfgravy.Pdf('tests/pdfs/apple_65.pdf', {'clip': {1: clip}}).pages[0]
+
+        assert all([clip[1] <= x.midy <= clip[3] for x in page.chars])
+        assert len(page.chars) < len(full.chars)
+        ref = set([x.text for x in full.words if clip[1] < x.midy < clip[3]])
+        assert set([x.text for x in page.words]) <= ref
+        assert all([x.y1 >= clip[1] and x.y0 <= clip[3] for x in page.lines])
+
+class NativeLinesTest(unittest.TestCase):
+
+    def test_native_lines(self):
+        for f in ['FB_2', 'msft']:
+            ref = pdfgravy.Pdf(f'tests/pdfs/{f}.pdf').pages[0]
+            page = pdfgravy.Pdf(f'tests/pdfs/{f}.pdf', {'native_lines': True}).pages[0]
+
+            assert not page.boxes
+            assert len(page.words) == len(ref.words)
+            shared = set([x.text for x in page.words]) & set([x.text for x in ref.words])
+            assert len(shared) >= 0.95 * len(set([x.text for x in ref.words]))
+
+class ParallelTablesTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pdf = pdfgravy.Pdf(PATH)
+
+    def test_compact(self):
+        page = self.pdf.pages[0].compact()
+
+        assert [x.text for x in page.words] == [x.text for x in self.pdf.words]
+        assert len(page.lines) == len(self.pdf.pages[0].lines)
+        assert not hasattr(page.words[0][0], 'graphicstate')
+
+    def test_workers(self):
+        settings = {'strategy': 'lines'}
+        serial = pdfgravy.Pdf(PATH).extract_tables(settings)
+        out = self.pdf.extract_tables(settings, workers=2)
+
+        assert list(out) == list(serial) == [1]
+        for a, b in zip(out[1].values(), serial[1].values()):
+            assert a.title == b.title
+            assert [x.title for x in a.spokes] == [x.title for x in b.spokes]
+            assert a.page is self.pdf.pages[0]
+
+        assert self.pdf.extract_tables(settings, pages=[2]) == {}
+
+    def test_workers_failed_spokes(self):
+        serial = pdfgravy.Pdf(PATH).extract_tables()
+        out = pdfgravy.Pdf(PATH).extract_tables(workers=2)
+
+        assert list(out) == list(serial) == [1]
+        assert [x.title for x in out[1].values()] == \
+                                        [x.title for x in serial[1].values()]
+        for a, b in zip(out[1].values(), serial[1].values()):
+            try:
+                b.spokes
+            except Exception as e:
+                assert a.error == f'{type(e).__name__}: {e}'
+                with self.assertRaises(type(e)):
+                    a.spokes
+            else:
+                assert a.error is None
+                assert [x.title for x in a.spokes] == \
+                                                [x.title for x in b.spokes]
+
+class BudgetTest(unittest.TestCase):
+
+    def test_no_limits(self):
+        pdf = pdfgravy.Pdf(PATH)
+        assert pdf.budget_records == []
+        assert pdf.pages[0].budget is None
+
+    def test_max_objects(self):
+        full = pdfgravy.Pdf(PATH).pages[0]
+        for action in ['skip', 'truncate', 'degrade']:
+            pdf = pdfgravy.Pdf(PATH, {'max_objects': 200, 'budget_action': action})
+            page = pdf.pages[0]
+            rec, = pdf.budget_records
+
+            assert rec['limit'] == 'objects' and rec['stage'] == 'interpret'
+            assert rec['action'] == action and rec['value'] > rec['max']
+            if action == 'skip':
+                assert not page.chars and not page.words
+            else:
+                assert 0 < len(page.chars) < len(full.chars)
+            assert bool(page.words) == (action == 'truncate')
+            if action != 'truncate':
+                assert not page.extract_tables()
+
+    def test_timeout(self):
+        pdf = pdfgravy.Pdf(PATH, {'page_timeout': 1e-6, 'budget_action': 'skip'})
+        rec, = pdf.budget_records
+        assert rec['limit'] == 'time' and rec['max'] == 1e-6
+        assert not pdf.pages[0].chars
+
+    def test_later_stage(self):
+        page = pdfgravy.Pdf(PATH).pages[0]
+        budget = Budget(1e-6)
+        assert not page.in_budget(budget, 'get_words')
+        assert page.budget['stage'] == 'get_words'
+        assert page.in_budget(budget, 'get_chars')  # Degraded to chars only
+
+    def test_mid_stage(self):
+        page = pdfgravy.Pdf(PATH).pages[0]
+        assert page.get_check('get_words') is None  # No page_timeout
+
+        check = page.get_check('get_words', Budget(1e-6))
+        with self.assertRaises(BudgetExceeded):
+            page.get_words(check)
+
+        page.limits = Budget(1e-6, action='truncate')
+        assert page.extract_tables() == {}
+        assert page.budget['stage'] == 'extract_tables'
+
+    def test_bad_action(self):
+        with self.assertRaises(ValueError):
+            pdfgravy.Pdf(PATH, {'max_objects': 10, 'budget_action': 'drop'})
+
+class InspectTest(unittest.TestCase):
+
+    def test_inspect(self):
+        pdf = pdfgravy.Pdf.inspect(PATH)
+        assert pdf.page_count == 1 and not pdf.pages
+        assert pdf.info == pdfgravy.Pdf(PATH).info
+        assert len(pdf.bmarks) == 0
+
+    def test_outline(self):
+        for named in [False, True]:
+            data = make_pdf(pages=2, sections=2, outline=True, named_dests=named)
+            info = pdfgravy.Pdf.inspect(data)
+            assert info.page_count == 2
+            assert not info.bmarks._dests  # Resolved on first access
+            assert [x for x, y in info.bmarks][:2] == \
+                            ['Sustainability report page 1', 'Section 1.1']
+
+            eager = pdfgravy.Pdf.inspect(data, resolve_dests=True)
+            assert eager.bmarks.doc is None  # Document released
+            pdf = pdfgravy.Pdf(data)
+            for bmarks in [info.bmarks, eager.bmarks, pdf.bmarks]:
+                page_no, top = bmarks.locate(3)
+                assert page_no == 2
+                header, = [x for x in pdf.pages[1].words
+                                        if x.text.startswith('Sustainability')]
+                assert abs(header.y1 - top) < 5
+
+class OutlineSectionsTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pdf = pdfgravy.Pdf(make_pdf(pages=2, words=300, sections=2,
+                                                                outline=True))
+
+    def test_sections(self):
+        secs = self.pdf.get_headed_sections([])
+
+        assert [x.title for x in secs] == ['Section 1.1', 'Section 1.2',
+                                           'Section 2.1', 'Section 2.2']
+        assert all([x.header.text == x.title for x in secs])
+        for sec, nxt in zip(secs, secs[1:]):
+            assert sec.header not in sec.words
+            assert min([x.y0 for x in sec.words]) >= nxt.header.y1
+        assert secs[0].words[0].y1 < secs[0].header.y0
+
+    def test_max_level(self):
+        assert self.pdf.get_outline_sections(max_level=-1) is None
+
+    def test_no_outline(self):
+        pdf = pdfgravy.Pdf(PATH)
+        assert pdf.get_outline_sections() is None
+        assert len(pdf.get_headed_sections(['energy'])) == \
+                    len(pdf.get_headed_sections(['energy'], outline=False))
+
+class OverprintTest(unittest.TestCase):
+
+    def test_redrawn_runs(self):
+        clean = pdfgravy.Pdf(make_pdf(words=100))
+        data = make_pdf(words=100, overprint=2)
+        raw = pdfgravy.Pdf(data)
+        pdf = pdfgravy.Pdf(data, {'overprint_tol': 0.5})
+
+        assert raw.overprints == 0
+        assert pdf.overprints == len(raw.pages[0].chars) - len(clean.pages[0].chars)
+        assert len(pdf.pages[0].chars) == len(clean.pages[0].chars)
+        assert [x.text for x in pdf.words] == [x.text for x in clean.words]
+
+    def test_per_glyph(self):
+        ops = [text(72 + 6 * i + dx, 700, x, 0, 10)
+                            for i, x in enumerate('Total') for dx in [0, 0.2]]
+        data = write_pdf([('\n'.join(ops), 792)], ['Courier'])
+
+        assert pdfgravy.Pdf(data).pages[0].text[0]._objs[1].get_text() == 'T'
+        pdf = pdfgravy.Pdf(data, {'overprint_tol': 0.5})
+        assert pdf.overprints == 5
+        assert [x.text for x in pdf.words] == ['Total']
@@ -0,0 +1,91 @@
+import unittest
+import time
+import pdfgravy
+from unittest import mock
+from pdfgravy.serve import Server
+from benchmarks.synthetic import make_pdf
+
+class ServeTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = Server(workers=1, queue=0)
+        cls.client = cls.server.app.test_client()
+
+        with open('tests/pdfs/msft.pdf', 'rb') as f:
+            cls.data = f.read()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.close()
+
+    def test_words(self):
+        resp = self.client.post('/words', data=self.data)
+        assert resp.status_code == 200
+        assert len(resp.get_json()[0]['words']) == 120
+
+    def test_page_y(self):
+        pages = self.client.post('/words', data=make_pdf(pages=2)).get_json()
+        tops = [max([x['y1'] for x in page['words']]) for page in pages]
+        assert len(tops) == 2 and tops[0] == tops[1] <= 792
+
+    def test_repeat_requests(self):
+        # The reused interpreter must not leak fonts between documents
+        first = self.client.post('/words', data=self.data).get_json()
+        second = self.client.post('/words', data=self.data).get_json()
+        assert first == second
+
+    def test_back_pressure(self):
+        self.server.slots.acquire()
+        try:
+            resp = self.client.post('/words', data=self.data)
+            assert resp.status_code == 503
+        finally:
+            self.server.slots.release()
+
+    def test_errors(self):
+        for data, query in [(b'not a pdf', ''), (self.data[:2000], ''),
+                                            (self.data, '?settings={bad')]:
+            resp = self.client.post('/words' + query, data=data)
+            assert resp.status_code == 400
+
+        with mock.patch.object(self.server, 'respond',
+                                        side_effect=RuntimeError('boom')):
+            resp = self.client.post('/words', data=self.data)
+        assert resp.status_code == 500
+        assert resp.get_json()['error'] == 'RuntimeError: boom'
+
+    def test_tables(self):
+        page, = self.client.post('/tables', data=self.data).get_json()
+        good, bad = page['tables']
+        assert good['spokes'] and 'error' not in good
+        assert bad['error'].startswith('IndexError') and 'spokes' not in bad
+
+    def test_bad_settings(self):
+        for query in ['?settings={"colour": 1}', '?table_settings={"x": 1}']:
+            resp = self.client.post('/tables' + query, data=self.data)
+            assert resp.status_code == 400
+            assert 'Unrecognized setting' in resp.get_json()['error']
+
+    def test_sections(self):
+        resp = self.client.post('/sections', data=self.data)
+        expected = pdfgravy.Pdf(self.data).get_headed_sections([])
+        assert resp.status_code == 200
+        assert len(resp.get_json()) == len(expected)
+
+    def test_timeout_slot(self):
+        server = Server(workers=1, queue=0, timeout=0.01)
+        try:
+            client = server.app.test_client()
+            resp = client.post('/words', data=make_pdf(words=2000))
+            assert resp.status_code == 504
+            assert not server.slots.acquire(blocking=False)  # Worker busy
+
+            for i in range(200):
+                if server.slots.acquire(blocking=False):
+                    break
+                time.sleep(0.05)
+            else:
+                self.fail('Slot not freed once the worker finished')
+            server.slots.release()
+        finally:
+            server.close()
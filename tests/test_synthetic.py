@@ -0,0 +1,38 @@
+import unittest
+import pdfgravy
+from benchmarks import run, synthetic, scaling
+
+class SyntheticTest(unittest.TestCase):
+
+    def test_make_pdf(self):
+        data = synthetic.make_pdf(pages=2, words=50, rows=4, cols=3, fonts=3)
+        pdf = pdfgravy.Pdf(data)
+        assert len(pdf.pages) == 2
+
+        tbls = pdf.pages[1].extract_tables({'strategy': 'lines'})
+        assert [x.title for x in tbls.values()] == ['Table 2: Emissions (mtCO2e)']
+        assert tbls[0].to_arrays()['values'].shape == (4, 3)
+        assert tbls[0].to_arrays()['cols'] == ['2019', '2018', '2017']
+
+    def test_fit(self):
+        assert round(scaling.fit_exponent([1, 2, 4], [3, 12, 48]), 6) == 2
+
+        results = {'a': {'exponent': 2.5}, 'b': {'exponent': None},
+                   'c': {'exponent': None, 'error': 'IndexError: '}}
+        bound = scaling.MAX_EXPONENT
+        assert scaling.check(results) == [('a', 2.5, bound), ('c', None, bound)]
+        assert scaling.check(results, {'a': 3}, required=['b']) == [
+                                        ('b', None, bound), ('c', None, bound)]
+
+    def test_rules(self):
+        plain = pdfgravy.Pdf(synthetic.make_pdf())
+        ruled = pdfgravy.Pdf(synthetic.make_pdf(rules=30))
+        assert len(ruled.lines) == len(plain.lines) + 30
+
+    def test_scale(self):
+        # Large enough for the per-page stages to be timed (see MIN_WALL)
+        results = scaling.scale('words', [150, 300, 600], base={'rows': 5})
+        assert list(results) == run.STAGES
+        required = ['interpret', 'ingest', 'get_words', 'get_lines',
+                                                            'extract_tables']
+        assert not scaling.check(results, required=required)
@@ -0,0 +1,180 @@
+import unittest
+import pdfgravy
+from pdfgravy import lattice
+from pdfgravy.grid import Grid, GridEngine
+from pdfgravy.table import Table
+from pdfgravy.cells import Intervals, parse_numbers
+from benchmarks.synthetic import make_pdf
+import numpy as np
+
+class LatticeTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.msft = pdfgravy.Pdf('tests/pdfs/msft.pdf').pages[0]
+        cls.apple = pdfgravy.Pdf('tests/pdfs/apple_65.pdf').pages[0]
+
+    def test_edges(self):
+        edges = lattice.snap_edges([(10, 0, 5), (11, 6, 20), (30, 0, 5)], 3)
+        assert lattice.join_edges(edges, 3) == [(10.5, 0, 20), (30, 0, 5)]
+
+    def test_tables(self):
+        tbls = self.msft.extract_tables({'strategy': 'lines'})
+
+        assert [x.title for x in tbls.values()] == [
+            'Greenhouse Gas Emissions (mtCO2e)',
+            'Greenhouse Gas Emissions Normalized by Revenue (mtCO2e/M$)']
+
+        v_spokes = [x for x in tbls[1].spokes if x.orientation == 'v']
+        assert [x.title for x in v_spokes] == ['FY19', 'FY18', 'FY17']
+        assert tbls[1].grid.matrix[-2][0].text == 'Scope 3 - Business Travel'
+
+    def test_spanning_cells(self):
+        tbl = self.apple.extract_tables({'strategy': 'lines'})[0]
+        matrix = tbl.grid.matrix
+
+        assert tbl.title == 'Energy'
+        assert matrix[1][0] is matrix[2][0]  # Row label spans sub-rows
+        assert matrix[1][3].text == '2,427'
+
+    def test_horizontal_rules(self):
+        # Without vertical rules there are no columns to read the cells by
+        for src in ['tests/pdfs/FB_2.pdf', make_pdf(lines=False)]:
+            page = pdfgravy.Pdf(src).pages[0]
+            assert page.extract_tables({'strategy': 'lines'}) == {}
+
+        tbl = pdfgravy.Pdf(make_pdf()).pages[0].extract_tables(
+                                                    {'strategy': 'lines'})[0]
+        assert tbl.to_arrays()['values'].shape == (10, 5)
+
+    def test_explicit_lines(self):
+        pdf = pdfgravy.Pdf(make_pdf(pages=2, words=50, rows=4, cols=3,
+                                                                lines=False))
+        settings = {'strategy': 'lines',
+                    'explicit_vertical_lines': [72, 222, 292, 362, 432]}
+        assert pdf.pages[0].y_offset > 0  # Pages are stacked in doc y
+        for i, page in enumerate(pdf.pages):
+            tbl, = page.extract_tables(settings).values()
+            assert tbl.title == f'Table {i + 1}: Emissions (mtCO2e)'
+            assert tbl.to_arrays()['cols'] == ['2019', '2018', '2017']
+
+    def test_intersection_tolerance(self):
+        settings = Table.Settings({'intersection_tolerance': 10})
+        assert settings['intersection_x_tolerance'] == 10
+        assert settings['intersection_y_tolerance'] == 10
+
+        settings = Table.Settings({'intersection_tolerance': 10,
+                                            'intersection_y_tolerance': 0})
+        assert settings['intersection_y_tolerance'] == 0
+
+class TablesTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.page = pdfgravy.Pdf('tests/pdfs/msft.pdf').pages[0]
+
+    def test_lazy_spokes(self):
+        tbls = self.page.extract_tables({'strategy': 'lines'})
+        assert not any([hasattr(x, '_spokes') for x in tbls.values()])
+
+        assert tbls[0].spokes is tbls[0].spokes
+        assert not hasattr(tbls[1], '_spokes')
+
+    def test_failed_spokes(self):
+        # Text strategy spokes of this table fail - which mustn't be cached
+        tbl = self.page.extract_tables()[1]
+        for i in range(2):
+            with self.assertRaises(IndexError):
+                tbl.spokes
+        assert not hasattr(tbl, '_spokes')
+
+    def test_select(self):
+        tbls = self.page.extract_tables()  # Headers/titles only
+        assert [x.header.text for x in tbls.values()] == ['FY19 FY18 FY17'] * 2
+
+        sel = tbls.select(r'^greenhouse gas emissions \(')
+        assert list(sel) == [1]
+        assert not tbls.select('energy')
+
+class CellsTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        page = pdfgravy.Pdf('tests/pdfs/msft.pdf').pages[0]
+        cls.tbl = page.extract_tables({'strategy': 'lines'})[1]
+
+    def test_intervals(self):
+        spans = Intervals([(10, 20), (0, 50), (30, 40)])
+        assert spans.find(15) == 0
+        assert spans.find(25) == 1
+        assert spans.find(35) == 2
+        assert spans.find(60) is None
+
+    def test_matrix(self):
+        cells = self.tbl.cells
+        assert cells.shape == (4, 3)
+        assert [x.text for x in cells.matrix[2]] == ['2.2', '1.7', '1.4']
+
+        word = cells[(2, 0)][0]
+        assert cells.word_to_cell(word) == (2, 0)
+        assert cells.get(word.midx, word.midy) is cells[(2, 0)]
+        assert cells.lookup(0, 0) is None
+
+    def test_parse_numbers(self):
+        out = parse_numbers(['105,940', '93%', '-', '(1.4)', '$3.1M', 'FY19'])
+        assert np.allclose(out['values'][[0, 1, 3, 4]], [105940, 93, -1.4, 3.1])
+        assert out['missing'].tolist() == [False, False, True, False, False, True]
+        assert out['percent'].tolist() == [False, True, False, False, False, False]
+        assert out['units'][4] == '$M'
+
+    def test_parse_units(self):
+        out = parse_numbers(['100 m3', '5 tCO2e', '12 m2', '3.5 kgCO2e/m2',
+                                                            '10 20', '1 2a'])
+        assert out['values'][:4].tolist() == [100, 5, 12, 3.5]
+        assert out['units'][:4].tolist() == ['m3', 'tCO2e', 'm2', 'kgCO2e/m2']
+        assert out['missing'].tolist() == [False] * 4 + [True] * 2
+
+    def test_to_arrays(self):
+        out = self.tbl.to_arrays()
+        assert out['values'].shape == (4, 3)
+        assert out['values'][2].tolist() == [2.2, 1.7, 1.4]
+        assert out['cols'] == ['FY19', 'FY18', 'FY17']
+        assert not out['missing'].any()
+
+class GridEngineTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.page = pdfgravy.Pdf('tests/pdfs/apple_65.pdf').pages[0]
+
+    def test_memo(self):
+        engine = GridEngine(self.page)
+        assert engine.get(300, 600, 100, 650) is engine.get(300, 600, 100, 650)
+
+    def test_restricted(self):
+        msft = pdfgravy.Pdf('tests/pdfs/msft.pdf').pages[0]
+        for page, window in [(self.page, (300, 600, 100, 650)),
+                             (self.page, (None, 400, 200, 500)),
+                             (msft, (None, 361.75, 317.0, 560.61)),
+                             (msft, (None, 256.56, 112.63, 643.61))]:
+            ref = Grid(page, *window)
+            grid = GridEngine(page).get(*window)
+
+            assert [x.text for x in grid.words] == [x.text for x in ref.words]
+            assert len(grid.lines) == len(ref.lines)
+            assert sorted([x.text for x in grid.cols]) == \
+                                        sorted([x.text for x in ref.cols])
+            # Outside words mustn't bridge rows which are apart in the window
+            assert [x.text for x in grid.rows] == [x.text for x in ref.rows]
+
+    def test_align_clusters(self):
+        words = self.page.words
+        for orientation, vars in [('horizontal', ['x0', 'x1', 'midx']),
+                                  ('vertical', ['y0', 'y1', 'midy'])]:
+            out, align = words.mega_cluster(orientation, 2)
+            assert align in vars
+            assert len(out) == 3
+            for clusters in out:
+                assert sum([len(x) for x in clusters]) == len(words)
+
+            # Gap clustering - every neighbour in a cluster within tolerance
+            for var, clusters in zip(vars, out):
+                for cluster in clusters:
+                    vals = sorted([getattr(x, var) for x in cluster])
+                    assert all([b - a <= 2 for a, b in zip(vals, vals[1:])])
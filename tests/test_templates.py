@@ -0,0 +1,67 @@
+import unittest
+import numpy as np
+import tempfile
+import os
+import pdfgravy
+from pdfgravy.templates import Fingerprint, TemplateStore, TemplateTable
+from pdfgravy.table import Table
+from benchmarks.synthetic import make_pdf
+
+PATH = 'tests/pdfs/msft.pdf'
+SETTINGS = {'strategy': 'lines'}
+
+class TemplateTest(unittest.TestCase):
+
+    def test_reuse(self):
+        store = TemplateStore()
+        ref = store.extract_tables(pdfgravy.Pdf(PATH).pages[0], SETTINGS)
+        tbls = store.extract_tables(pdfgravy.Pdf(PATH).pages[0], SETTINGS)
+
+        assert (store.hits, store.misses) == (1, 1)
+        assert all([isinstance(x, TemplateTable) for x in tbls.values()])
+        for a, b in zip(ref.values(), tbls.values()):
+            assert a.title == b.title
+            assert np.array_equal(a.to_arrays()['values'],
+                                  b.to_arrays()['values'], equal_nan=True)
+
+    def test_page_position(self):
+        # Same layout as the first page of a one or two page document
+        first = pdfgravy.Pdf(make_pdf(pages=2, seed=1)).pages[0]
+        only = pdfgravy.Pdf(make_pdf(pages=1, seed=1)).pages[0]
+        assert first.y_offset > 0 and only.y_offset == 0
+
+        settings = Table.Settings(SETTINGS)
+        assert Fingerprint(first, settings).similarity(
+                                    Fingerprint(only, settings)) == 1
+
+        store = TemplateStore()
+        ref = store.extract_tables(only, SETTINGS)
+        tbls = store.extract_tables(first, SETTINGS)
+
+        assert (store.hits, store.misses) == (1, 1)
+        for a, b in zip(ref.values(), tbls.values()):
+            assert np.array_equal(a.to_arrays()['values'],
+                                  b.to_arrays()['values'], equal_nan=True)
+
+    def test_mismatch(self):
+        store = TemplateStore(min_similarity=0)  # Match anything
+        store.extract_tables(pdfgravy.Pdf(PATH).pages[0], SETTINGS)
+
+        page = pdfgravy.Pdf('tests/pdfs/apple_65.pdf').pages[0]
+        tbls = store.extract_tables(page, SETTINGS)
+
+        assert store.misses == 2  # Words didn't fit so fell back
+        assert [x.title for x in tbls.values()] == ['Energy']
+
+    def test_save(self):
+        store = TemplateStore()
+        store.extract_tables(pdfgravy.Pdf(PATH).pages[0], SETTINGS)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'templates.json')
+            store.save(path)
+            loaded = TemplateStore()
+            loaded.load(path)
+
+        loaded.extract_tables(pdfgravy.Pdf(PATH).pages[0], SETTINGS)
+        assert loaded.hits == 1
@@ -0,0 +1,22 @@
+import unittest
+import pdfgravy
+from pdfgravy import utils
+
+class FontCacheTest(unittest.TestCase):
+
+    def test_shared_fonts(self):
+        ctx = utils.InterpreterContext()
+        ref = pdfgravy.Pdf('tests/pdfs/apple_65.pdf')
+
+        for f in ['apple_65', 'msft', 'apple_65']:
+            pdf = pdfgravy.Pdf(f'tests/pdfs/{f}.pdf', interpreter=ctx)
+        
+        assert ctx.rsrcmgr.hits > 0
+        assert [x.text for x in pdf.words] == [x.text for x in ref.words]
+        assert pdf.fonts == ref.fonts
+
+    def test_bounded(self):
+        ctx = utils.InterpreterContext(font_cache_size=2)
+        pdfgravy.Pdf('tests/pdfs/apple_65.pdf', interpreter=ctx)
+
+        assert len(ctx.rsrcmgr._cached_fonts) == 2